@@ -386,6 +386,12 @@ const App: React.FC = () => {
             visaRisk: result.visaRisk,
             reasoning: result.reasoning,
             evaluatedBy: result.evaluatedBy,
+            evaluationTier: result.evaluationTier,
+            visaRiskSource: result.visaRiskSource,
+            matchedSkills: result.matchedSkills,
+            missingSkills: result.missingSkills,
+            niceToHaveSkills: result.niceToHaveSkills,
+            skillCoverage: result.skillCoverage,
             status: 'DONE'
           } : j));
           setArtifactCache(prev => {
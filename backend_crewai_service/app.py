@@ -1,5 +1,8 @@
 import os
 import json
+import uuid
+import itertools
+from contextlib import contextmanager
 import base64
 from io import BytesIO
 from flask import Flask, request, jsonify, Response, stream_with_context
@@ -16,12 +19,154 @@ from crews import (
     run_evaluation_batch_llm,
     run_resume_crew_streaming,
 )
+from ingest import dataset_store, iter_jobs_from_csv, open_text_stream
+from request_stream import StreamedBatch, RequestBodyTooLarge
+from response_encoding import COLUMNAR_MIMETYPE, wants_columnar, to_columnar, compress_response
+from skills import compute_skill_features
+from shared_state import shared_state, content_hash
+from scheduler import llm_scheduler, PRIORITY_INTERACTIVE, PRIORITY_BULK
+from deadlines import (
+    CallContext,
+    DeadlineExceeded,
+    RequestCancelled,
+    call_context,
+    iter_with_heartbeat,
+    make_disconnect_probe,
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
 app = Flask(__name__)
 CORS(app) # Enable CORS for all routes
+app.json.compact = True # No pretty-printing, even under debug
+
+@app.after_request
+def encode_response(response):
+    # gzip/brotli per Accept-Encoding; streamed JSONL is compressed chunk by chunk (response_encoding.py)
+    return compress_response(response, request.accept_encodings)
+
+def batch_results_response(results: list, status: int = 200, **extra):
+    """Batch results as a list of objects, or as parallel arrays when the client Accepts the columnar type."""
+    if wants_columnar(request.accept_mimetypes):
+        response = jsonify({**to_columnar(results), **extra})
+        response.mimetype = COLUMNAR_MIMETYPE
+    else:
+        response = jsonify({"results": results, **extra})
+    response.vary.add('Accept')
+    return response, status
+
+def resolve_jobs(data: dict):
+    """
+    Returns the jobs for a batch request: either inline `jobs`, or jobs read from a previously
+    ingested dataset via `datasetId` plus `jobRange` ([start, end)) or `jobIds`. Dataset jobs
+    come back as an iterator that pages through the store, so a large range is never held in
+    memory at once; None when the reference matches no jobs. Raises ValueError for a malformed
+    `jobRange` or `jobIds`.
+    """
+    jobs = data.get('jobs')
+    dataset_id = data.get('datasetId')
+    if jobs or not dataset_id:
+        return jobs
+    job_ids = data.get('jobIds')
+    job_range = data.get('jobRange')
+    if job_ids:
+        if not isinstance(job_ids, list) or not all(isinstance(j, (str, int)) and not isinstance(j, bool) for j in job_ids):
+            raise ValueError("jobIds must be a list of job IDs")
+        dataset_jobs = dataset_store.iter_by_ids(dataset_id, job_ids)
+    elif job_range is not None:
+        if (not isinstance(job_range, list) or len(job_range) != 2
+                or not all(isinstance(n, int) and not isinstance(n, bool) and n >= 0 for n in job_range)):
+            raise ValueError("jobRange must be [start, end] with non-negative integer positions")
+        dataset_jobs = dataset_store.iter_range(dataset_id, job_range[0], job_range[1])
+    else:
+        return None
+    first = next(dataset_jobs, None)
+    return None if first is None else itertools.chain([first], dataset_jobs)
+
+# Batch bodies are parsed off request.stream (see request_stream.py); evaluate_batch_v2 sends
+# one LLM call per STREAM_BATCH_CHUNK_JOBS jobs so scoring starts before the upload finishes
+STREAM_BATCH_CHUNK_JOBS = int(os.getenv("STREAM_BATCH_CHUNK_JOBS", "25"))
+
+def open_batch_request(*required):
+    """
+    Starts parsing a batch request body. Returns (data, jobs): the session-resolved top-level
+    fields (None for an unknown sessionHandle) and an iterator over the inline jobs as they
+    arrive, or the dataset slice they reference. `required` fields are awaited before dispatch.
+    """
+    batch = StreamedBatch(request.stream, request.mimetype)
+    fields = batch.header(lambda f: bool(f.get('sessionHandle')) or all(f.get(k) for k in required))
+    data = resolve_session(fields)
+    if data is None:
+        return None, None
+    return data, batch.jobs() if batch.has_jobs else resolve_jobs(data)
+
+def iter_chunks(items, size: int):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def optional_flag(value):
+    # JSON booleans pass through; strings/numbers follow the env-var convention ("1"/"true"/"yes"),
+    # so a "false" string does not switch a feature on
+    if value is None or isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes")
+
+def update_batch_status(batch_id, **status):
+    # Batch status lives in shared state so any worker can answer /jobs/batch_status
+    if batch_id:
+        shared_state.set_batch_status(batch_id, **status)
+
+def session_key(data: dict) -> str:
+    # Fair-queuing key for the LLM scheduler: explicit sessionId or session handle, else the client address
+    return data.get('sessionId') or data.get('sessionHandle') or request.remote_addr or "anonymous"
+
+# Per-endpoint deadlines (seconds) passed down to every crew and LLM call; requests may ask
+# for a shorter one via `deadlineSeconds`
+DEADLINE_PANEL_SECONDS = float(os.getenv("DEADLINE_PANEL_SECONDS", "180"))
+DEADLINE_BATCH_SECONDS = float(os.getenv("DEADLINE_BATCH_SECONDS", "900"))
+DEADLINE_RESUME_SECONDS = float(os.getenv("DEADLINE_RESUME_SECONDS", "600"))
+# Keep-alive interval for /resume/generate; a failed write is how a closed browser is noticed
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "5"))
+
+def request_deadline(data: dict, deadline: float) -> float:
+    requested = data.get('deadlineSeconds')
+    return min(float(requested), deadline) if requested else deadline
+
+@contextmanager
+def request_scope(data: dict, priority: str, deadline: float, probe=None):
+    """Tags LLM work with its scheduler class/session and the request's deadline and disconnect probe."""
+    with llm_scheduler.context(priority, session_key(data)):
+        with call_context(request_deadline(data, deadline), probe) as ctx:
+            yield ctx
+
+# Registered sessions (resume, intent, instructions, panel) expire after SESSION_TTL_SECONDS
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(24 * 3600)))
+SESSION_FIELDS = ('resumeText', 'userIntent', 'instructions', 'agents')
+
+def resolve_session(data: dict):
+    """
+    Fills resumeText/userIntent/instructions/agents from a registered `sessionHandle`.
+    Fields sent explicitly in the request win. Returns None for an unknown or expired handle.
+    """
+    # contentHash keys shared result caches, so it is only ever taken from server-side state
+    data = {k: v for k, v in data.items() if k != 'contentHash'}
+    handle = data.get('sessionHandle')
+    if not handle:
+        return data
+    session = shared_state.cache_get("session", handle)
+    if session is None:
+        return None
+    overrides = {k: v for k, v in data.items() if v is not None}
+    if any(k in overrides for k in ('resumeText', 'userIntent', 'instructions')):
+        session.pop('contentHash', None)
+    return {**session, **overrides}
 
 # Basic route to check if the server is running
 @app.route('/')
@@ -52,6 +197,73 @@ def upload_pdf():
         print(f"Error processing PDF: {e}")
         return jsonify({"error": f"Failed to process PDF: {str(e)}"}), 500
 
+@app.route('/datasets/upload_csv', methods=['POST'])
+def upload_csv():
+    # Accept either a multipart upload (field "file") or a raw text/csv request body.
+    # Both are consumed as a stream so large exports are never fully held in memory.
+    upload = request.files.get('file')
+    binary_stream = upload.stream if upload else request.stream
+
+    try:
+        summary = dataset_store.ingest(iter_jobs_from_csv(open_text_stream(binary_stream)))
+        if summary["count"] == 0:
+            dataset_store.delete(summary["datasetId"])
+            return jsonify({"error": "No jobs found in CSV"}), 400
+        return jsonify(summary), 200
+    except Exception as e:
+        print(f"Error ingesting CSV: {e}")
+        traceback.print_exc()
+        return jsonify({"error": f"Failed to ingest CSV: {str(e)}"}), 500
+
+@app.route('/datasets/<dataset_id>/jobs', methods=['GET'])
+def list_dataset_jobs(dataset_id):
+    if not dataset_store.exists(dataset_id):
+        return jsonify({"error": "Unknown or expired datasetId"}), 404
+    start = request.args.get('start', 0, type=int)
+    limit = min(request.args.get('limit', 500, type=int), 5000)
+    jobs = dataset_store.get_range(dataset_id, start, start + limit)
+    return jsonify({"datasetId": dataset_id, "total": dataset_store.count(dataset_id), "start": start, "jobs": jobs}), 200
+
+@app.route('/datasets/<dataset_id>', methods=['DELETE'])
+def delete_dataset(dataset_id):
+    dataset_store.delete(dataset_id)
+    return jsonify({"datasetId": dataset_id, "deleted": True}), 200
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    data = request.json
+    resume_text = data.get('resumeText')
+    user_intent = data.get('userIntent')
+
+    if not all([resume_text, user_intent]):
+        return jsonify({"error": "Missing resumeText or userIntent"}), 400
+
+    session = {k: data.get(k) for k in SESSION_FIELDS if data.get(k) is not None}
+    # Build the v2 instructions server-side so clients never upload them (they embed the resume again)
+    session.setdefault('instructions', generate_evaluation_instructions(resume_text, user_intent))
+    session['contentHash'] = content_hash(resume_text, user_intent, session['instructions'])
+
+    handle = uuid.uuid4().hex
+    shared_state.cache_set("session", handle, session, ttl=SESSION_TTL_SECONDS)
+    return jsonify({"sessionHandle": handle, "contentHash": session['contentHash'], "expiresIn": SESSION_TTL_SECONDS}), 200
+
+@app.route('/sessions/<handle>', methods=['PATCH'])
+def update_session(handle):
+    # Attach or replace the agent panel / instructions once they are known
+    session = shared_state.cache_get("session", handle)
+    if session is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
+    data = request.json
+    session.update({k: data[k] for k in ('instructions', 'agents') if data.get(k) is not None})
+    session['contentHash'] = content_hash(session['resumeText'], session['userIntent'], session['instructions'])
+    shared_state.cache_set("session", handle, session, ttl=SESSION_TTL_SECONDS)
+    return jsonify({"sessionHandle": handle, "contentHash": session['contentHash']}), 200
+
+@app.route('/sessions/<handle>', methods=['DELETE'])
+def delete_session(handle):
+    shared_state.cache_delete("session", handle)
+    return jsonify({"sessionHandle": handle, "deleted": True}), 200
+
 @app.route('/test_gemini', methods=['GET'])
 def test_gemini():
     api_key = os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY") or os.getenv("API_KEY")
@@ -65,7 +277,9 @@ def test_gemini():
 
 @app.route('/agents/create_panel', methods=['POST'])
 def create_panel():
-    data = request.json
+    data = resolve_session(request.json)
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
     resume_text = data.get('resumeText')
     user_intent = data.get('userIntent')
     job_payload = data.get('job') or {}
@@ -78,10 +292,15 @@ def create_panel():
         print(f"[Backend Log - {type.upper()}] {agent_name}: {message}")
     
     try:
-        agent_panel = build_evaluation_panel(resume_text, user_intent, backend_on_log)
+        with request_scope(data, PRIORITY_INTERACTIVE, DEADLINE_PANEL_SECONDS, make_disconnect_probe(request.environ)):
+            agent_panel = build_evaluation_panel(resume_text, user_intent, backend_on_log)
         if not agent_panel:
              return jsonify({"error": "Failed to create agent panel"}), 500
         return jsonify({"agents": agent_panel}), 200
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
+    except RequestCancelled as e:
+        return jsonify({"error": str(e)}), 499
     except ValueError as e:
         status = 429 if "rate limit" in str(e).lower() or "quota" in str(e).lower() else 400
         return jsonify({"error": str(e)}), status
@@ -91,11 +310,19 @@ def create_panel():
 
 @app.route('/jobs/analyze_batch', methods=['POST'])
 def analyze_batch():
-    data = request.json
+    try:
+        data, jobs = open_batch_request('resumeText', 'userIntent', 'agents')
+    except RequestBodyTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
     resume_text = data.get('resumeText')
     user_intent = data.get('userIntent')
-    jobs = data.get('jobs')
     agent_panel = data.get('agents') # Expect the pre-built agent panel
+    cascade = optional_flag(data.get('cascade')) # Optional: override EVALUATION_CASCADE for this request
+    batch_id = data.get('batchId') # Optional: progress is published under this ID
 
     if not all([resume_text, user_intent, jobs, agent_panel]):
         return jsonify({"error": "Missing resumeText, userIntent, jobs, or agents panel"}), 400
@@ -104,31 +331,51 @@ def analyze_batch():
         print(f"[Backend Log - {type.upper()}] {agent_name}: {message}")
 
     results = []
+    # Streamed jobs have no known total until the body has been read
+    update_batch_status(batch_id, state="running", total=len(jobs) if isinstance(jobs, list) else None, completed=0)
     try:
-        for job in jobs:
-            job_id = job.get('id', 'N/A')
-            def make_logger(jid):
-                return lambda msg, type, name: backend_on_log(f"(Job ID: {jid}) {msg}", type, name)
-            on_log_with_job = make_logger(job_id)
+        with request_scope(data, PRIORITY_BULK, DEADLINE_BATCH_SECONDS, make_disconnect_probe(request.environ)) as ctx:
+            for job in jobs:
+                ctx.check()
+                job_id = job.get('id', 'N/A')
+                def make_logger(jid):
+                    return lambda msg, type, name: backend_on_log(f"(Job ID: {jid}) {msg}", type, name)
+                on_log_with_job = make_logger(job_id)
 
-            result = run_evaluation_crew(resume_text, user_intent, job, agent_panel, on_log_with_job)
-            print(f"[Backend Log - INFO] Dispatcher: (Job ID: {job_id}) Normalized result: {result}")
-            results.append(result)
+                result = run_evaluation_crew(resume_text, user_intent, job, agent_panel, on_log_with_job, cascade=cascade)
+                print(f"[Backend Log - INFO] Dispatcher: (Job ID: {job_id}) Normalized result: {result}")
+                results.append(result)
+                update_batch_status(batch_id, completed=len(results))
 
+        update_batch_status(batch_id, state="done", total=len(results))
         # The agent panel is now managed by the frontend, so we don't return it here.
-        return jsonify({"results": results}), 200
+        return batch_results_response(results)
+    except (DeadlineExceeded, RequestCancelled) as e:
+        # Return whatever finished before the deadline/disconnect
+        print(f"Batch analysis stopped after {len(results)} jobs: {e}")
+        update_batch_status(batch_id, state="cancelled" if isinstance(e, RequestCancelled) else "timeout", error=str(e))
+        return batch_results_response(results, 504 if isinstance(e, DeadlineExceeded) else 499, error=str(e), partial=True)
+    except RequestBodyTooLarge as e:
+        print(f"Batch analysis stopped after {len(results)} jobs: {e}")
+        update_batch_status(batch_id, state="error", error=str(e))
+        return batch_results_response(results, 413, error=str(e), partial=True)
     except ValueError as e:
-        print(f"Validation error during batch analysis: {e}")
+        # Includes a body that turns malformed mid-jobs: keep the results already paid for
+        print(f"Validation error during batch analysis after {len(results)} jobs: {e}")
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 400
+        update_batch_status(batch_id, state="error", error=str(e))
+        return batch_results_response(results, 400, error=str(e), partial=True)
     except Exception as e:
         print(f"Error analyzing job batch: {e}")
         traceback.print_exc()
+        update_batch_status(batch_id, state="error", error=str(e))
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
 @app.route('/agents/create_resume_panel', methods=['POST'])
 def create_resume_panel():
-    data = request.json
+    data = resolve_session(request.json)
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
     resume_text = data.get('resumeText')
     user_intent = data.get('userIntent')
     job_payload = data.get('job') or {}
@@ -141,10 +388,15 @@ def create_resume_panel():
         print(f"[Backend Log - {type.upper()}] {agent_name}: {message}")
     
     try:
-        panel = build_resume_panel(resume_text, user_intent, job_description, backend_on_log)
+        with request_scope(data, PRIORITY_INTERACTIVE, DEADLINE_PANEL_SECONDS, make_disconnect_probe(request.environ)):
+            panel = build_resume_panel(resume_text, user_intent, job_description, backend_on_log)
         if not panel:
             return jsonify({"error": "Failed to create resume panel"}), 500
         return jsonify({"agents": panel}), 200
+    except DeadlineExceeded as e:
+        return jsonify({"error": str(e)}), 504
+    except RequestCancelled as e:
+        return jsonify({"error": str(e)}), 499
     except ValueError as e:
         status = 429 if "rate limit" in str(e).lower() or "quota" in str(e).lower() else 400
         return jsonify({"error": str(e)}), status
@@ -154,7 +406,9 @@ def create_resume_panel():
 
 @app.route('/instructions/evaluation', methods=['POST'])
 def create_evaluation_instructions():
-    data = request.json
+    data = resolve_session(request.json)
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
     resume_text = data.get('resumeText')
     user_intent = data.get('userIntent')
     if not all([resume_text, user_intent]):
@@ -168,28 +422,87 @@ def create_evaluation_instructions():
 
 @app.route('/jobs/evaluate_batch_v2', methods=['POST'])
 def evaluate_batch_v2():
-    data = request.json
+    try:
+        data, jobs = open_batch_request('resumeText', 'userIntent', 'instructions')
+    except RequestBodyTooLarge as e:
+        return jsonify({"error": str(e)}), 413
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
     resume_text = data.get('resumeText')
     user_intent = data.get('userIntent')
-    jobs = data.get('jobs')
     instructions = data.get('instructions')
+    cascade = optional_flag(data.get('cascade')) # Optional: override EVALUATION_CASCADE for this request
+    batch_id = data.get('batchId') # Optional: progress is published under this ID
 
     if not all([resume_text, user_intent, jobs, instructions]):
         return jsonify({"error": "Missing resumeText, userIntent, jobs, or instructions"}), 400
 
+    results = []
+    update_batch_status(batch_id, state="running", total=len(jobs) if isinstance(jobs, list) else None, completed=0)
     try:
-        results = run_evaluation_batch_llm(resume_text, user_intent, jobs, instructions)
-        return jsonify({"results": results}), 200
+        with request_scope(data, PRIORITY_BULK, DEADLINE_BATCH_SECONDS, make_disconnect_probe(request.environ)):
+            # Each chunk is scored as soon as its jobs have been read off the request body
+            for chunk in iter_chunks(jobs, STREAM_BATCH_CHUNK_JOBS):
+                results.extend(run_evaluation_batch_llm(resume_text, user_intent, chunk, instructions, cascade=cascade, content_key=data.get('contentHash')))
+                update_batch_status(batch_id, completed=len(results))
+        update_batch_status(batch_id, state="done", total=len(results), completed=len(results))
+        return batch_results_response(results)
+    except (DeadlineExceeded, RequestCancelled) as e:
+        # Return the chunks scored before the deadline/disconnect
+        print(f"Batch v2 evaluation stopped after {len(results)} jobs: {e}")
+        update_batch_status(batch_id, state="cancelled" if isinstance(e, RequestCancelled) else "timeout", error=str(e))
+        return batch_results_response(results, 504 if isinstance(e, DeadlineExceeded) else 499, error=str(e), partial=True)
+    except RequestBodyTooLarge as e:
+        update_batch_status(batch_id, state="error", error=str(e))
+        return batch_results_response(results, 413, error=str(e), partial=True)
     except ValueError as e:
+        # A rate limit or a body that turns malformed mid-jobs: keep the chunks already scored
+        print(f"Batch v2 evaluation stopped after {len(results)} jobs: {e}")
+        update_batch_status(batch_id, state="error", error=str(e))
         status = 429 if "rate limit" in str(e).lower() or "quota" in str(e).lower() else 400
-        return jsonify({"error": str(e)}), status
+        return batch_results_response(results, status, error=str(e), partial=True)
     except Exception as e:
         print(f"Error in evaluate_batch_v2: {e}")
+        update_batch_status(batch_id, state="error", error=str(e))
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
+@app.route('/jobs/batch_status/<batch_id>', methods=['GET'])
+def batch_status(batch_id):
+    status = shared_state.get_batch_status(batch_id)
+    if not status:
+        return jsonify({"error": "Unknown batchId"}), 404
+    return jsonify(status), 200
+
+@app.route('/scheduler/stats', methods=['GET'])
+def scheduler_stats():
+    # Per-class admissions, queue depth and queue-wait times for this worker process
+    return jsonify(llm_scheduler.stats()), 200
+
+@app.route('/jobs/skill_features', methods=['POST'])
+def skill_features():
+    # Local-only: no LLM calls. Returns the skill fields the batch endpoints attach to their results
+    data = resolve_session(request.json)
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
+    resume_text = data.get('resumeText')
+    try:
+        jobs = resolve_jobs(data)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not all([resume_text, jobs]):
+        return jsonify({"error": "Missing resumeText or jobs"}), 400
+
+    features = compute_skill_features(resume_text, jobs)
+    return jsonify({"results": [{"id": job_id, **f} for job_id, f in features.items()]}), 200
+
 @app.route('/resume/generate', methods=['POST'])
 def generate_resume():
-    data = request.json
+    data = resolve_session(request.json)
+    if data is None:
+        return jsonify({"error": "Unknown or expired sessionHandle"}), 404
     resume_text = data.get('resumeText')
     user_intent = data.get('userIntent') # User's career goal
     job = data.get('job')
@@ -201,11 +514,26 @@ def generate_resume():
         print(f"[Backend Log - {type.upper()}] {agent_name}: {message}")
 
     try:
-        # Stream crew progress and final resume back to the frontend as JSONL
+        # Stream crew progress and final resume back to the frontend as JSONL.
+        # The crew runs on a worker thread (see iter_with_heartbeat) under this request's
+        # scheduler class and deadline; the response generator only relays its chunks.
+        ctx = CallContext(request_deadline(data, DEADLINE_RESUME_SECONDS))
+        session = session_key(data)
+
+        def crew_chunks():
+            with llm_scheduler.context(PRIORITY_INTERACTIVE, session), call_context(ctx=ctx):
+                yield from run_resume_crew_streaming(resume_text, user_intent, job, backend_on_log)
+
         def event_stream():
             try:
-                for chunk in run_resume_crew_streaming(resume_text, user_intent, job, backend_on_log):
-                    yield json.dumps(chunk) + "\n"
+                for chunk in iter_with_heartbeat(crew_chunks, STREAM_HEARTBEAT_SECONDS, ctx):
+                    # Blank keep-alive lines are skipped by the frontend's JSONL reader
+                    yield "\n" if chunk is None else json.dumps(chunk) + "\n"
+            except GeneratorExit:
+                # The server closes the generator once the client is gone; stop the crew
+                print("Client disconnected from /resume/generate; cancelling crew")
+                ctx.cancel()
+                raise
             except Exception as e:
                 print(f"Streaming error: {e}")
                 yield json.dumps({"error": str(e)}) + "\n"
@@ -1,5 +1,7 @@
 import os
 import json
+from contextlib import contextmanager
+from typing import Optional
 from crewai import Agent, Task, Crew, Process
 
 __all__ = [
@@ -13,6 +15,18 @@ __all__ = [
 ]
 from langchain_community.chat_models import ChatLiteLLM
 from dotenv import load_dotenv
+from visa_rules import classify_visa_risk, is_visa_agent
+from skills import compute_skill_features
+from shared_state import shared_state, content_hash
+from scheduler import llm_scheduler, PRIORITY_INTERACTIVE
+from deadlines import (
+    DeadlineExceeded,
+    RequestCancelled,
+    check_call_context,
+    current_call_context,
+    hedged_call,
+    run_with_deadline,
+)
 
 # Load environment variables
 load_dotenv()
@@ -34,6 +48,49 @@ EVALUATION_MODEL_NAME = os.getenv("GEMINI_EVALUATION_MODEL_NAME", "gemini-2.5-fl
 PANEL_CREATION_MODEL_NAME = os.getenv("GEMINI_PANEL_CREATION_MODEL_NAME", "gemini-2.5-flash")
 RESUME_MODEL_NAME = os.getenv("GEMINI_RESUME_MODEL_NAME", "gemini-2.5-flash")
 
+# --- Evaluation Cascade ---
+# When cascade mode is on, every job is first scored by a lighter model; only borderline
+# results (matchScore inside the uncertainty band, or a visa risk listed in
+# EVALUATION_CASCADE_ESCALATE_VISA) are re-scored by EVALUATION_MODEL_NAME.
+# - GEMINI_CASCADE_MODEL_NAME: Model for the first pass (default: gemini-2.5-flash-lite)
+# - EVALUATION_CASCADE: "1"/"true" to enable cascade by default (callers may override per request)
+# - EVALUATION_CASCADE_BAND_LOW / EVALUATION_CASCADE_BAND_HIGH: inclusive matchScore band to escalate
+# - EVALUATION_CASCADE_ESCALATE_VISA: comma-separated visa risks to escalate (default: MEDIUM)
+CASCADE_MODEL_NAME = os.getenv("GEMINI_CASCADE_MODEL_NAME", "gemini-2.5-flash-lite")
+CASCADE_ENABLED = os.getenv("EVALUATION_CASCADE", "false").lower() in ("1", "true", "yes")
+CASCADE_BAND_LOW = int(os.getenv("EVALUATION_CASCADE_BAND_LOW", "60"))
+CASCADE_BAND_HIGH = int(os.getenv("EVALUATION_CASCADE_BAND_HIGH", "85"))
+CASCADE_ESCALATE_VISA = {
+    v.strip().upper()
+    for v in os.getenv("EVALUATION_CASCADE_ESCALATE_VISA", "MEDIUM").split(",")
+    if v.strip()
+}
+
+# --- Visa Pre-Classifier ---
+# VISA_PRECLASSIFIER: "1"/"true" (default) to resolve explicit sponsorship language locally
+# (see visa_rules.py) so those jobs skip the visa lens in LLM prompts and panels.
+VISA_PRECLASSIFIER_ENABLED = os.getenv("VISA_PRECLASSIFIER", "true").lower() in ("1", "true", "yes")
+
+# --- Skill Features ---
+# SKILL_FEATURES: "1"/"true" (default) to extract matched/missing must-have skills locally
+# (see skills.py) and feed them to evaluation prompts alongside the description.
+# SKILL_PROMPT_DESCRIPTION_CHARS: description length kept in prompts when skills were found and
+# visa risk was settled locally (otherwise the full description is sent).
+SKILL_FEATURES_ENABLED = os.getenv("SKILL_FEATURES", "true").lower() in ("1", "true", "yes")
+SKILL_PROMPT_DESCRIPTION_CHARS = int(os.getenv("SKILL_PROMPT_DESCRIPTION_CHARS", "1500"))
+
+# --- Shared Rate Limit ---
+# GEMINI_RPM_LIMIT: requests per minute allowed per model across every worker process on the
+# node (counted in shared_state.py's SQLite file). 0 disables the limiter.
+# GEMINI_RPM_INTERACTIVE_SHARE: fraction of that budget bulk traffic may not use, so interactive
+# calls (panel creation, resume generation) still get through during large batches (default: 0.2).
+GEMINI_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", "0"))
+GEMINI_RPM_INTERACTIVE_SHARE = float(os.getenv("GEMINI_RPM_INTERACTIVE_SHARE", "0.2"))
+
+# Tier labels recorded on each evaluation result (`evaluationTier`)
+TIER_LIGHT = "light"
+TIER_FULL = "full"
+
 # --- Utilities ---
 def clean_json(text: str) -> str:
     # Handles common LLM JSON output issues (markdown, etc.)
@@ -58,6 +115,122 @@ def extract_output(result):
     return str(result) if result is not None else ""
 
 
+def needs_escalation(result: dict) -> bool:
+    """
+    Decides whether a first-pass (light tier) evaluation is borderline enough to be
+    re-scored by the full evaluation model.
+    """
+    if not result:
+        return True
+    score = result.get("matchScore", 0)
+    visa = str(result.get("visaRisk", "")).upper()
+    return CASCADE_BAND_LOW <= score <= CASCADE_BAND_HIGH or visa in CASCADE_ESCALATE_VISA
+
+
+def preclassify_visa(job: dict):
+    """Returns the local visa verdict for a job (see visa_rules.classify_visa_risk), or None."""
+    if not VISA_PRECLASSIFIER_ENABLED:
+        return None
+    return classify_visa_risk(job.get('description') or '')
+
+
+def reserve_llm_calls(llm, count: int = 1) -> None:
+    """Blocks until `count` calls to this model fit the node-wide GEMINI_RPM_LIMIT window."""
+    ctx = current_call_context()
+    max_wait = 120.0 if ctx is None or ctx.remaining() is None else min(120.0, ctx.remaining())
+    # A wait cut short by the deadline surfaces as DeadlineExceeded (via the check), not a rate-limit error
+    shared_state.acquire(f"rpm:{llm.model}", _rpm_limit(), cost=count, max_wait=max_wait, check=check_call_context)
+
+
+def try_reserve_llm_calls(llm, count: int = 1) -> bool:
+    """Non-blocking reserve, used for optional extra calls such as hedged requests."""
+    return shared_state.try_acquire(f"rpm:{llm.model}", _rpm_limit(), cost=count)
+
+
+def _rpm_limit() -> int:
+    limit = GEMINI_RPM_LIMIT
+    if limit and llm_scheduler.current_priority() != PRIORITY_INTERACTIVE:
+        limit = max(1, int(limit * (1 - GEMINI_RPM_INTERACTIVE_SHARE)))
+    return limit
+
+
+def _call_timeout():
+    # HTTP timeout for an LLM request: whatever is left of the current request's deadline
+    ctx = current_call_context()
+    remaining = ctx.remaining() if ctx is not None else None
+    return None if remaining is None else max(1.0, remaining)
+
+
+def with_call_timeout(llm):
+    """
+    Copy of a ChatLiteLLM client whose timeout is the time left before the deadline, so an
+    abandoned call (timed out, disconnected, or a losing hedge) stops spending quota. Used both
+    for direct invokes and as a crew agent's llm; for crews the timeout is fixed when the crew is
+    built, so it can only exceed the time actually left, never the deadline.
+    """
+    timeout = _call_timeout()
+    if timeout is None:
+        return llm
+    return llm.model_copy(update={"request_timeout": timeout, "timeout": timeout})
+
+
+def crew_step_guard(_step_output) -> None:
+    # Crew step callback: stops an abandoned crew at its next step once the request is gone
+    check_call_context()
+
+
+@contextmanager
+def llm_call_slot(llm, count: int = 1):
+    """
+    Every LLM call and crew run goes through here: the scheduler admits it by priority class
+    and session (see scheduler.py), then the node-wide rate limit is reserved. Both waits
+    give up once the request's deadline passes or its client disconnects (see deadlines.py).
+    """
+    check_call_context()
+    with llm_scheduler.slot(check=check_call_context):
+        reserve_llm_calls(llm, count)
+        check_call_context()
+        yield
+
+
+def skill_features_for(resume_text: str, jobs: list) -> dict:
+    """Returns {job_id: skill features} (see skills.compute_skill_features), or {} when disabled."""
+    if not SKILL_FEATURES_ENABLED:
+        return {}
+    return compute_skill_features(resume_text, jobs)
+
+
+def has_skill_signal(features) -> bool:
+    # Postings outside the vocabulary yield empty features; those are no finding at all
+    return bool(features and (features['matchedSkills'] or features['missingSkills']))
+
+
+def prompt_description(job: dict, features, visa_preset=None) -> str:
+    # With precomputed skill overlap the model only needs the gist of the posting. The full
+    # text is kept unless visa risk is already settled, since sponsorship language is often
+    # at the very end of a posting and the model still has to judge it.
+    description = job.get('description') or ''
+    if has_skill_signal(features) and visa_preset and len(description) > SKILL_PROMPT_DESCRIPTION_CHARS:
+        return description[:SKILL_PROMPT_DESCRIPTION_CHARS] + "..."
+    return description
+
+
+def format_skill_features(features) -> str:
+    if not has_skill_signal(features):
+        return ""
+    return (
+        f"Matched must-haves: {', '.join(features['matchedSkills']) or 'none'}; "
+        f"Missing must-haves: {', '.join(features['missingSkills']) or 'none'}"
+    )
+
+
+def apply_visa_preset(result: dict, visa_preset) -> dict:
+    if visa_preset:
+        result['visaRisk'] = visa_preset['visaRisk']
+        result['visaRiskSource'] = 'rules'
+    return result
+
+
 def ensure_valid_api_response(error: Exception):
     """
     Re-raises a clearer error when the Gemini API rejects a request because
@@ -102,9 +275,16 @@ if not api_key:
 # Ensure API key is set in environment for LiteLLM (expects GOOGLE_API_KEY for Gemini)
 os.environ["GOOGLE_API_KEY"] = api_key 
 
-llm_evaluation = ChatLiteLLM(model=f"gemini/{EVALUATION_MODEL_NAME}", temperature=0.7)
-llm_panel_creation = ChatLiteLLM(model=f"gemini/{PANEL_CREATION_MODEL_NAME}", temperature=0.7)
-llm_resume = ChatLiteLLM(model=f"gemini/{RESUME_MODEL_NAME}", temperature=0.5)
+class DeadlineChatLiteLLM(ChatLiteLLM):
+    # ChatLiteLLM's own invoke honours request_timeout, but CrewAI builds an agent's client from
+    # the LLM's attributes and reads `timeout`; declaring it lets one client carry the deadline
+    # on both paths (see with_call_timeout)
+    timeout: Optional[float] = None
+
+llm_evaluation = DeadlineChatLiteLLM(model=f"gemini/{EVALUATION_MODEL_NAME}", temperature=0.7)
+llm_evaluation_light = DeadlineChatLiteLLM(model=f"gemini/{CASCADE_MODEL_NAME}", temperature=0.7)
+llm_panel_creation = DeadlineChatLiteLLM(model=f"gemini/{PANEL_CREATION_MODEL_NAME}", temperature=0.7)
+llm_resume = DeadlineChatLiteLLM(model=f"gemini/{RESUME_MODEL_NAME}", temperature=0.5)
 
 
 # --- PROMPT TEMPLATES ---
@@ -182,7 +362,7 @@ Each object: `name`, `role`, `focus` (one crisp instruction for their stage), `e
 ]
 """
 
-AGENT_TASK_PROMPT = lambda resume_text, job_title, job_company, job_description, agent_name, agent_focus, previous_analyses: f"""
+AGENT_TASK_PROMPT = lambda resume_text, job_title, job_company, job_description, agent_name, agent_focus, previous_analyses, visa_preset=None, skill_features=None: f"""
 **CANDIDATE'S FULL RESUME:**
 ```
 {resume_text}
@@ -192,6 +372,7 @@ AGENT_TASK_PROMPT = lambda resume_text, job_title, job_company, job_description,
 - Title: {job_title}
 - Company: {job_company}
 - Description: {job_description}
+{f"- Precomputed Skill Overlap: {format_skill_features(skill_features)}" if has_skill_signal(skill_features) else ""}
 
 **PRIOR ANALYSES FROM YOUR TEAM:**
 {''.join(f'- {analysis} \\n' for analysis in previous_analyses) if previous_analyses else "You are the first agent. No prior analysis."}
@@ -205,7 +386,7 @@ Provide your analysis based *only* on your focus.
 
 **DEFINITIONS AND SCORING**
 - Match Score (0-100): Evidence the candidate can do THIS job now, at the stated level. 95-100 = exceptional, near-perfect alignment (skills/domain/scope/impact match role level); 80-94 = strong, clear evidence across most required skills and scope; 65-79 = partial/adjacent, some gaps in level, domain, or scope; 45-64 = weak, multiple gaps or step-up without proof; <45 = poor fit.
-- Visa Risk (candidate perspective): Likelihood hiring would be blocked by sponsorship/authorization. LOW = work authorized in the role’s country OR explicit employer/role sponsorship is common/indicated; MEDIUM = unclear signals about authorization or sponsorship; HIGH = likely needs sponsorship with no indication the employer will sponsor.
+{f"- Visa Risk: ALREADY DETERMINED as {visa_preset['visaRisk']} from explicit posting language ({', '.join(visa_preset['evidence'])}). Do not re-assess it; report it as-is." if visa_preset else "- Visa Risk (candidate perspective): Likelihood hiring would be blocked by sponsorship/authorization. LOW = work authorized in the role’s country OR explicit employer/role sponsorship is common/indicated; MEDIUM = unclear signals about authorization or sponsorship; HIGH = likely needs sponsorship with no indication the employer will sponsor."}
 - Be critical: map experience to the role’s seniority (team size, budget, systems complexity, leadership scope) and domain requirements. Use only facts from the resume and job description; if info is missing, state the gap in reasoning.
 
 **REQUIRED OUTPUT (return ONLY valid JSON):**
@@ -224,6 +405,12 @@ def build_evaluation_panel(resume_text: str, user_intent: str, on_log):
     Note: A dummy job description is used as the panel should be generic based on user intent, not a specific job.
     """
     on_log("Building agent evaluation panel...", 'info', 'Architect')
+
+    cache_key = content_hash(PANEL_CREATION_MODEL_NAME, resume_text, user_intent)
+    cached_panel = shared_state.cache_get("evaluation_panel", cache_key)
+    if cached_panel:
+        on_log(f"Reusing cached panel of {len(cached_panel)} agents.", 'info', 'Architect')
+        return cached_panel
     
     # Using a generic job description to build a reusable panel
     dummy_job_description = f"A role focused on {user_intent}."
@@ -232,7 +419,7 @@ def build_evaluation_panel(resume_text: str, user_intent: str, on_log):
         role='AI Team Architect',
         goal='Recruit an optimal, 4-person hiring committee to evaluate job opportunities for a candidate.',
         backstory='An expert in designing multi-agent systems for critical business analysis.',
-        llm=llm_panel_creation,
+        llm=with_call_timeout(llm_panel_creation),
         verbose=True,
     )
 
@@ -242,9 +429,10 @@ def build_evaluation_panel(resume_text: str, user_intent: str, on_log):
         agent=panel_architect
     )
 
-    panel_crew = Crew(agents=[panel_architect], tasks=[panel_creation_task], verbose=True)
+    panel_crew = Crew(agents=[panel_architect], tasks=[panel_creation_task], verbose=True, step_callback=crew_step_guard)
     try:
-        panel_json_str = extract_output(panel_crew.kickoff())
+        with llm_call_slot(llm_panel_creation):
+            panel_json_str = extract_output(run_with_deadline(panel_crew.kickoff))
     except Exception as e:
         ensure_valid_api_response(e)
         raise
@@ -265,6 +453,8 @@ def build_evaluation_panel(resume_text: str, user_intent: str, on_log):
                 "emoji": config.get('emoji', '🤖')
             })
         on_log(f"Successfully built a panel of {len(agents_info)} agents.", 'info', 'Architect')
+        if agents_info:
+            shared_state.cache_set("evaluation_panel", cache_key, agents_info)
         return agents_info
     except json.JSONDecodeError as e:
         on_log(f"Failed to parse agent panel JSON: {e}. Raw output: {panel_json_str}", 'error', 'Architect')
@@ -273,6 +463,12 @@ def build_evaluation_panel(resume_text: str, user_intent: str, on_log):
 def build_resume_panel(resume_text: str, user_intent: str, job_description: str, on_log):
     on_log("Building resume editing team...", 'info', 'Director')
 
+    cache_key = content_hash(PANEL_CREATION_MODEL_NAME, resume_text, user_intent, job_description)
+    cached_panel = shared_state.cache_get("resume_panel", cache_key)
+    if cached_panel:
+        on_log(f"Reusing cached resume team of {len(cached_panel)} agents.", 'info', 'Director')
+        return cached_panel
+
     panel_creation_task = Task(
         description=BUILD_RESUME_PANEL_PROMPT(resume_text, user_intent, job_description),
         expected_output='A JSON array of 4 agent objects.',
@@ -280,14 +476,15 @@ def build_resume_panel(resume_text: str, user_intent: str, job_description: str,
             role='Editorial Director',
             goal='Recruit a high-impact resume writing crew.',
             backstory='Expert in constructing resume ghostwriting teams.',
-            llm=llm_panel_creation,
+            llm=with_call_timeout(llm_panel_creation),
             verbose=True,
         )
     )
 
-    panel_crew = Crew(agents=[panel_creation_task.agent], tasks=[panel_creation_task], verbose=True)
+    panel_crew = Crew(agents=[panel_creation_task.agent], tasks=[panel_creation_task], verbose=True, step_callback=crew_step_guard)
     try:
-        panel_json_str = extract_output(panel_crew.kickoff())
+        with llm_call_slot(llm_panel_creation):
+            panel_json_str = extract_output(run_with_deadline(panel_crew.kickoff))
     except Exception as e:
         ensure_valid_api_response(e)
         raise
@@ -304,6 +501,8 @@ def build_resume_panel(resume_text: str, user_intent: str, job_description: str,
                 "focus": config.get('focus', 'Editing'),
                 "emoji": config.get('emoji', '📝')
             })
+        if agents_info:
+            shared_state.cache_set("resume_panel", cache_key, agents_info)
         return agents_info
     except Exception as e:
         on_log(f"Failed to parse resume panel: {e}", 'error', 'Director')
@@ -340,17 +539,47 @@ Instructions:
 """
     return prompt
 
-def run_evaluation_batch_llm(resume_text: str, user_intent: str, jobs: list, instructions: str):
-    job_snippets = "\n".join([f"- ID: {j.get('id')} | Title: {j.get('title')} | Company: {j.get('company')} | Desc: {j.get('description')}" for j in jobs])
+def _evaluate_batch_with_llm(llm, jobs: list, instructions: str, tier: str, visa_presets: dict, skill_features: dict, cache_scope: str):
+    # Serve jobs already evaluated by this model for the same resume/instructions from the
+    # shared cache; only the remainder goes to the LLM.
+    cache_keys = {
+        str(j.get('id')): content_hash(llm.model, cache_scope, j.get('id'), j.get('title'), j.get('company'), j.get('description'))
+        for j in jobs
+    }
+    results = {}
+    for job_id, key in cache_keys.items():
+        cached_result = shared_state.cache_get("evaluation_batch", key)
+        if cached_result:
+            results[job_id] = cached_result
+    pending = [j for j in jobs if str(j.get('id')) not in results]
+    if pending:
+        for result in _invoke_batch_llm(llm, pending, instructions, tier, visa_presets, skill_features):
+            if result["id"] in cache_keys:
+                shared_state.cache_set("evaluation_batch", cache_keys[result["id"]], result)
+                results[result["id"]] = result
+    return [results[str(j.get('id'))] for j in jobs if str(j.get('id')) in results]
+
+def _invoke_batch_llm(llm, jobs: list, instructions: str, tier: str, visa_presets: dict, skill_features: dict):
+    def snippet(j):
+        features = skill_features.get(str(j.get('id')))
+        preset = visa_presets.get(str(j.get('id')))
+        line = f"- ID: {j.get('id')} | Title: {j.get('title')} | Company: {j.get('company')} | Desc: {prompt_description(j, features, preset)}"
+        if has_skill_signal(features):
+            line = f"{line} | Skills: {format_skill_features(features)}"
+        return f"{line} | VisaRisk: PRESET {preset['visaRisk']}" if preset else line
+    job_snippets = "\n".join(snippet(j) for j in jobs)
+    preset_note = "\nJobs marked \"VisaRisk: PRESET\" already have visa risk determined from explicit posting language; copy it and spend no reasoning on visa.\n" if visa_presets else ""
     prompt = f"""{instructions}
-
+{preset_note}
 Jobs to evaluate:
 {job_snippets}
 
 Return ONLY a JSON array of results.
 """
     try:
-        raw_response = llm_evaluation.invoke(prompt)
+        with llm_call_slot(llm):
+            timed_llm = with_call_timeout(llm)
+            raw_response = hedged_call(lambda: timed_llm.invoke(prompt), llm.model, allow_hedge=lambda: try_reserve_llm_calls(llm))
     except Exception as e:
         ensure_valid_api_response(e)
         raise
@@ -361,25 +590,100 @@ Return ONLY a JSON array of results.
         # Normalize fields
         normalized = []
         for item in data:
-            normalized.append({
-                "id": str(item.get("id")),
+            job_id = str(item.get("id"))
+            normalized.append(apply_visa_preset({
+                "id": job_id,
                 "matchScore": int(item.get("matchScore", 0)),
                 "visaRisk": str(item.get("visaRisk", "HIGH")).upper(),
                 "reasoning": item.get("reasoning", ""),
-                "evaluatedBy": item.get("evaluatedBy", "Evaluator_Panel")
-            })
+                "evaluatedBy": item.get("evaluatedBy", "Evaluator_Panel"),
+                "evaluationTier": tier,
+                **skill_features.get(job_id, {}),
+            }, visa_presets.get(job_id)))
         return normalized
     except Exception as e:
         raw_text = raw_response.content if hasattr(raw_response, "content") else raw_response
         print(f"Failed to parse batch eval: {e}, raw: {raw_text}")
         return []
 
+def run_evaluation_batch_llm(resume_text: str, user_intent: str, jobs: list, instructions: str, cascade: bool = None, content_key: str = None):
+    """
+    Evaluates a batch of jobs in a single LLM call.
+    With cascade enabled, the light model scores every job and only borderline results
+    (see needs_escalation) or jobs it failed to return are re-scored by the full model.
+    `content_key` is a precomputed hash of resume/intent/instructions (e.g. a session's
+    contentHash) used to key the result cache instead of rehashing them per batch.
+    """
+    if cascade is None:
+        cascade = CASCADE_ENABLED
+    visa_presets = {}
+    for j in jobs:
+        preset = preclassify_visa(j)
+        if preset:
+            visa_presets[str(j.get("id"))] = preset
+    skill_features = skill_features_for(resume_text, jobs)
+    cache_scope = content_key or content_hash(resume_text, user_intent, instructions)
+    if not cascade:
+        return _evaluate_batch_with_llm(llm_evaluation, jobs, instructions, TIER_FULL, visa_presets, skill_features, cache_scope)
+
+    try:
+        first_pass = {r["id"]: r for r in _evaluate_batch_with_llm(llm_evaluation_light, jobs, instructions, TIER_LIGHT, visa_presets, skill_features, cache_scope)}
+    except (DeadlineExceeded, RequestCancelled):
+        raise
+    except Exception as e:
+        # The light tier is an optimization: if its model is unavailable, score everything on the full tier
+        print(f"[CrewAI] Cascade: {CASCADE_MODEL_NAME} failed ({e}); evaluating batch with {EVALUATION_MODEL_NAME}")
+        return _evaluate_batch_with_llm(llm_evaluation, jobs, instructions, TIER_FULL, visa_presets, skill_features, cache_scope)
+    escalate = [j for j in jobs if needs_escalation(first_pass.get(str(j.get("id"))))]
+    print(f"[CrewAI] Cascade: {len(jobs) - len(escalate)}/{len(jobs)} jobs settled by {CASCADE_MODEL_NAME}, escalating {len(escalate)} to {EVALUATION_MODEL_NAME}")
+    if escalate:
+        for result in _evaluate_batch_with_llm(llm_evaluation, escalate, instructions, TIER_FULL, visa_presets, skill_features, cache_scope):
+            first_pass[result["id"]] = result
+
+    # Preserve the input order of job IDs
+    return [first_pass[str(j.get("id"))] for j in jobs if str(j.get("id")) in first_pass]
+
 # --- CREW 1, Phase 2: Run Evaluation ---
-def run_evaluation_crew(resume_text: str, user_intent: str, job: dict, agent_panel: list, on_log):
+def run_evaluation_crew(resume_text: str, user_intent: str, job: dict, agent_panel: list, on_log, cascade: bool = None):
     """
     Runs the job evaluation using a pre-built hiring committee.
+    With cascade enabled, the committee first runs on the light model and is only re-run
+    on the full evaluation model when the verdict is borderline (see needs_escalation).
     """
-    on_log(f"Starting evaluation for job '{job['title']}'...", 'info', 'Dispatcher')
+    if cascade is None:
+        cascade = CASCADE_ENABLED
+
+    # Explicit sponsorship language settles visa risk locally; drop the visa specialist
+    # (never the final synthesizer) so the crew spends no calls on it.
+    visa_preset = preclassify_visa(job)
+    if visa_preset:
+        on_log(f"Visa risk pre-classified as {visa_preset['visaRisk']} ({', '.join(visa_preset['evidence'])}); skipping visa lens.", 'info', 'Dispatcher')
+        agent_panel = [c for c in agent_panel[:-1] if not is_visa_agent(c)] + agent_panel[-1:]
+
+    skill_features = skill_features_for(resume_text, [job]).get(str(job.get('id')))
+
+    if not cascade:
+        return _run_evaluation_crew_with_llm(resume_text, job, agent_panel, on_log, llm_evaluation, TIER_FULL, visa_preset, skill_features)
+
+    try:
+        result = _run_evaluation_crew_with_llm(resume_text, job, agent_panel, on_log, llm_evaluation_light, TIER_LIGHT, visa_preset, skill_features)
+    except ValueError as e:
+        # Rate-limit/API errors from the light model fall back to the full tier instead of failing the job
+        on_log(f"{CASCADE_MODEL_NAME} failed ({e}); evaluating with {EVALUATION_MODEL_NAME}.", 'warning', 'Dispatcher')
+        return _run_evaluation_crew_with_llm(resume_text, job, agent_panel, on_log, llm_evaluation, TIER_FULL, visa_preset, skill_features)
+    if result.get('evaluatedBy') != 'System' and not needs_escalation(result):
+        return result
+    on_log(f"Borderline verdict (score {result.get('matchScore')}, visa {result.get('visaRisk')}); escalating to {EVALUATION_MODEL_NAME}.", 'info', 'Dispatcher')
+    return _run_evaluation_crew_with_llm(resume_text, job, agent_panel, on_log, llm_evaluation, TIER_FULL, visa_preset, skill_features)
+
+def _run_evaluation_crew_with_llm(resume_text: str, job: dict, agent_panel: list, on_log, llm, tier: str, visa_preset=None, skill_features=None):
+    cache_key = content_hash(llm.model, resume_text, agent_panel, job.get('id'), job.get('title'), job.get('company'), job.get('description'))
+    cached_result = shared_state.cache_get("evaluation_crew", cache_key)
+    if cached_result:
+        on_log(f"Reusing cached {tier} tier evaluation for job '{job['title']}'.", 'info', 'Dispatcher')
+        return cached_result
+
+    on_log(f"Starting evaluation for job '{job['title']}' ({tier} tier)...", 'info', 'Dispatcher')
 
     agents = []
     tasks = []
@@ -389,25 +693,26 @@ def run_evaluation_crew(resume_text: str, user_intent: str, job: dict, agent_pan
             role=config['role'],
             goal=f"Evaluate job '{job['title']}' based on your focus: {config['focus']}.",
             backstory=f"You are {config['name']}, an expert in your domain.",
-            llm=llm_evaluation,
+            llm=with_call_timeout(llm),
             verbose=True,
         )
         agents.append(agent)
         
         task = Task(
             description=AGENT_TASK_PROMPT(
-                resume_text, job['title'], job['company'], job['description'],
-                config['name'], config['focus'], []
+                resume_text, job['title'], job['company'], prompt_description(job, skill_features, visa_preset),
+                config['name'], config['focus'], [], visa_preset, skill_features
             ),
             expected_output='A concise paragraph of analysis if you are an expert, or a final JSON object if you are the Hiring Manager.',
             agent=agent
         )
         tasks.append(task)
 
-    evaluation_crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+    evaluation_crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True, step_callback=crew_step_guard)
 
     try:
-        final_result = extract_output(evaluation_crew.kickoff())
+        with llm_call_slot(llm, len(agents)):
+            final_result = extract_output(run_with_deadline(evaluation_crew.kickoff))
         on_log("Evaluation crew finished successfully.", 'info', 'Dispatcher')
         
         result_dict = {}
@@ -428,11 +733,17 @@ def run_evaluation_crew(resume_text: str, user_intent: str, job: dict, agent_pan
         # The agent panel is now passed in, so it's no longer added here.
             # It will be handled at the batch level.
         result_dict['id'] = job['id'] # Add the job ID to the result
+        result_dict['evaluationTier'] = tier
+        result_dict.update(skill_features or {})
+        apply_visa_preset(result_dict, visa_preset)
+        shared_state.cache_set("evaluation_crew", cache_key, result_dict)
         return result_dict
+    except (DeadlineExceeded, RequestCancelled):
+        raise
     except Exception as e:
         ensure_valid_api_response(e)
         on_log(f"Evaluation crew failed for job '{job['title']}': {e}", 'error', 'Dispatcher')
-        return {"id": job['id'], "matchScore": 0, "visaRisk": "HIGH", "reasoning": "Crew failed during evaluation.", "evaluatedBy": "System"}
+        return {"id": job['id'], "matchScore": 0, "visaRisk": "HIGH", "reasoning": "Crew failed during evaluation.", "evaluatedBy": "System", "evaluationTier": tier}
 
 
 # --- AUTONOMOUS CREW 2: RESUME GENERATION ---
@@ -448,7 +759,7 @@ def run_resume_crew(resume_text: str, user_intent: str, job: dict, on_log):
         role='Editorial Director',
         goal='Recruit an elite, 4-person ghostwriting team to tailor a resume.',
         backstory='An expert in building creative teams for high-impact content creation.',
-        llm=llm_panel_creation,  # Use dedicated panel creation model
+        llm=with_call_timeout(llm_panel_creation),  # Use dedicated panel creation model
         verbose=True,
     )
 
@@ -458,9 +769,10 @@ def run_resume_crew(resume_text: str, user_intent: str, job: dict, on_log):
         agent=editorial_director
     )
     
-    panel_crew = Crew(agents=[editorial_director], tasks=[panel_creation_task], verbose=True)
+    panel_crew = Crew(agents=[editorial_director], tasks=[panel_creation_task], verbose=True, step_callback=crew_step_guard)
     try:
-        panel_json_str = extract_output(panel_crew.kickoff())
+        with llm_call_slot(llm_panel_creation):
+            panel_json_str = extract_output(run_with_deadline(panel_crew.kickoff))
     except Exception as e:
         ensure_valid_api_response(e)
         raise
@@ -484,7 +796,7 @@ def run_resume_crew(resume_text: str, user_intent: str, job: dict, on_log):
             role=config['role'],
             goal=f"Contribute to tailoring a resume based on your focus: {config['focus']}.",
             backstory=f"You are {config['name']}, a key member of a resume ghostwriting team.",
-            llm=llm_resume,
+            llm=with_call_timeout(llm_resume),
             verbose=True,
         )
         agents.append(agent)
@@ -510,12 +822,15 @@ def run_resume_crew(resume_text: str, user_intent: str, job: dict, on_log):
         )
         tasks.append(task)
         
-    resume_crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+    resume_crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True, step_callback=crew_step_guard)
 
     try:
-        final_resume = extract_output(resume_crew.kickoff())
+        with llm_call_slot(llm_resume, len(agents)):
+            final_resume = extract_output(run_with_deadline(resume_crew.kickoff))
         on_log("Resume generation finished successfully.", 'info', 'Dispatcher')
         return final_resume
+    except (DeadlineExceeded, RequestCancelled):
+        raise
     except Exception as e:
         ensure_valid_api_response(e)
         on_log(f"Resume crew failed during execution: {e}", 'error', 'Dispatcher')
@@ -536,7 +851,7 @@ def run_resume_crew_streaming(resume_text: str, user_intent: str, job: dict, on_
         role='Editorial Director',
         goal='Recruit an elite, 4-person ghostwriting team to tailor a resume.',
         backstory='An expert in building creative teams for high-impact content creation.',
-        llm=llm_panel_creation,
+        llm=with_call_timeout(llm_panel_creation),
         verbose=True,
     )
 
@@ -546,9 +861,10 @@ def run_resume_crew_streaming(resume_text: str, user_intent: str, job: dict, on_
         agent=editorial_director
     )
 
-    panel_crew = Crew(agents=[editorial_director], tasks=[panel_creation_task], verbose=True)
+    panel_crew = Crew(agents=[editorial_director], tasks=[panel_creation_task], verbose=True, step_callback=crew_step_guard)
     try:
-        panel_json_str = extract_output(panel_crew.kickoff())
+        with llm_call_slot(llm_panel_creation):
+            panel_json_str = extract_output(run_with_deadline(panel_crew.kickoff))
     except Exception as e:
         ensure_valid_api_response(e)
         msg = f"Failed to build editorial team: {e}"
@@ -576,7 +892,7 @@ def run_resume_crew_streaming(resume_text: str, user_intent: str, job: dict, on_
             role=config['role'],
             goal=f"Contribute to tailoring a resume based on your focus: {config['focus']}.",
             backstory=f"You are {config['name']}, a key member of a resume ghostwriting team.",
-            llm=llm_resume,
+            llm=with_call_timeout(llm_resume),
             verbose=True,
         )
         agents.append(agent)
@@ -602,12 +918,13 @@ def run_resume_crew_streaming(resume_text: str, user_intent: str, job: dict, on_
         )
         tasks.append(task)
 
-    resume_crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+    resume_crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True, step_callback=crew_step_guard)
 
     try:
         # Emit a phase before running the crew and update per agent index
         yield {"phase": "writer", "message": "Running ghostwriting crew", "percent": 45}
-        final_resume = extract_output(resume_crew.kickoff())
+        with llm_call_slot(llm_resume, len(agents)):
+            final_resume = extract_output(run_with_deadline(resume_crew.kickoff))
         yield {"phase": "editor", "message": "Polishing and finalizing", "percent": 85}
         on_log("Resume generation finished successfully.", 'info', 'Dispatcher')
         yield {"generatedResume": final_resume, "phase": "done", "percent": 100}
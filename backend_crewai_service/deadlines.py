@@ -0,0 +1,266 @@
+import os
+import time
+import queue
+import socket
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+__all__ = [
+    "DeadlineExceeded",
+    "RequestCancelled",
+    "CallContext",
+    "call_context",
+    "current_call_context",
+    "check_call_context",
+    "run_with_deadline",
+    "hedged_call",
+    "iter_with_heartbeat",
+    "make_disconnect_probe",
+]
+
+# --- Hedging ---
+# - LLM_HEDGING: "1"/"true" to send a duplicate request when a call outlives the observed p95
+#   latency for its model and keep whichever finishes first (default: off; costs extra quota)
+# - LLM_HEDGING_MIN_SAMPLES: latency samples needed before p95 is trusted (default: 20)
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING", "false").lower() in ("1", "true", "yes")
+LLM_HEDGING_MIN_SAMPLES = int(os.getenv("LLM_HEDGING_MIN_SAMPLES", "20"))
+
+# How often blocked waits re-check the deadline, cancellation and client socket
+POLL_INTERVAL_SECONDS = 0.5
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+class CallContext:
+    """Deadline and cancellation state for one request, shared by every LLM call it makes."""
+
+    def __init__(self, timeout: float = None, probe=None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self._cancelled = threading.Event()
+        self._probe = probe
+
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if not self._cancelled.is_set() and self._probe is not None and self._probe():
+            print("[Deadlines] Client disconnected; cancelling pending LLM work")
+            self._cancelled.set()
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        if self.cancelled:
+            raise RequestCancelled("Client disconnected; request cancelled.")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceeded("Request deadline exceeded before the LLM finished.")
+
+
+_current = ContextVar("call_context", default=None)
+
+
+@contextmanager
+def call_context(timeout: float = None, probe=None, ctx: CallContext = None):
+    """Makes a new (or the given) CallContext current for every LLM call inside the block."""
+    ctx = ctx or CallContext(timeout, probe)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current.reset(token)
+
+
+def current_call_context():
+    return _current.get()
+
+
+def check_call_context() -> None:
+    """Raises DeadlineExceeded/RequestCancelled if the current request should stop."""
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.check()
+
+
+def _start(fn, results: queue.Queue, tag=None) -> None:
+    # Worker threads inherit contextvars (scheduler priority, call context) from the caller
+    ctx = copy_context()
+
+    def target():
+        try:
+            results.put((tag, True, ctx.run(fn)))
+        except BaseException as e:
+            results.put((tag, False, e))
+
+    threading.Thread(target=target, daemon=True).start()
+
+
+def _wait(results: queue.Queue, timeout: float = None):
+    """Waits for the next finished call, honouring the current deadline and cancellation."""
+    ctx = _current.get()
+    waited_until = time.monotonic() + timeout if timeout is not None else None
+    while True:
+        if ctx is not None:
+            ctx.check()
+        wait = POLL_INTERVAL_SECONDS
+        if ctx is not None and ctx.remaining() is not None:
+            wait = min(wait, ctx.remaining())
+        if waited_until is not None:
+            wait = min(wait, max(0.0, waited_until - time.monotonic()))
+        try:
+            return results.get(timeout=max(wait, 0.01))
+        except queue.Empty:
+            if waited_until is not None and time.monotonic() >= waited_until:
+                return None
+
+
+def run_with_deadline(fn):
+    """
+    Runs fn() on a worker thread and returns its result, raising DeadlineExceeded or
+    RequestCancelled as soon as the request's deadline passes or its client goes away.
+    Python threads cannot be killed, so an abandoned call finishes in the background;
+    crews stop at their next step via check_call_context in their step callback.
+    """
+    if _current.get() is None:
+        return fn()
+    results = queue.Queue()
+    _start(fn, results)
+    _, ok, value = _wait(results)
+    if not ok:
+        raise value
+    return value
+
+
+# --- Latency Tracking ---
+class LatencyTracker:
+    def __init__(self, window: int = 200):
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[key].append(seconds)
+
+    def p95(self, key: str):
+        with self._lock:
+            samples = sorted(self._samples[key])
+        if len(samples) < LLM_HEDGING_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+
+latency_tracker = LatencyTracker()
+
+
+def hedged_call(fn, key: str, allow_hedge=None):
+    """
+    Runs fn() under the current deadline. With LLM_HEDGING on and enough latency history for
+    `key`, a duplicate fn() is started once the first call outlives p95; the first to succeed
+    wins. `allow_hedge()` is consulted before duplicating (e.g. to reserve rate-limit quota).
+    """
+    started = time.monotonic()
+    p95 = latency_tracker.p95(key) if LLM_HEDGING_ENABLED else None
+    if p95 is None:
+        value = run_with_deadline(fn)
+        latency_tracker.record(key, time.monotonic() - started)
+        return value
+
+    results = queue.Queue()
+    _start(fn, results, tag="primary")
+    outcome = _wait(results, timeout=p95)
+    in_flight = 1
+    if outcome is None:
+        if allow_hedge is None or allow_hedge():
+            print(f"[Deadlines] {key} call exceeded p95 ({p95:.1f}s); sending hedged request")
+            _start(fn, results, tag="hedge")
+            in_flight = 2
+        outcome = _wait(results)
+
+    while True:
+        tag, ok, value = outcome
+        in_flight -= 1
+        if ok:
+            latency_tracker.record(key, time.monotonic() - started)
+            if tag == "hedge":
+                print(f"[Deadlines] Hedged request for {key} won")
+            return value
+        if in_flight == 0:
+            raise value
+        outcome = _wait(results)
+
+
+def iter_with_heartbeat(gen_fn, interval: float = 10.0, ctx: CallContext = None):
+    """
+    Drives the generator returned by gen_fn() on a worker thread and yields its items,
+    yielding None whenever `interval` seconds pass without one. Streaming responses turn
+    None into a keep-alive line, which is how a closed client connection gets noticed.
+    `ctx` (default: the current CallContext) is checked between items.
+    """
+    ctx = ctx or _current.get()
+    items = queue.Queue()
+    done = object()
+    thread_ctx = copy_context()
+
+    def target():
+        try:
+            for item in gen_fn():
+                items.put((True, item))
+        except BaseException as e:
+            items.put((False, e))
+        finally:
+            items.put((True, done))
+
+    threading.Thread(target=lambda: thread_ctx.run(target), daemon=True).start()
+    while True:
+        if ctx is not None:
+            ctx.check()
+        try:
+            ok, item = items.get(timeout=interval)
+        except queue.Empty:
+            yield None
+            continue
+        if not ok:
+            raise item
+        if item is done:
+            return
+        yield item
+
+
+def make_disconnect_probe(environ):
+    """
+    Best-effort check for a client that closed its connection while a non-streaming request
+    is still being processed: peeks the raw socket (werkzeug dev server or gunicorn) and
+    treats EOF as a disconnect. Returns None when the server does not expose the socket.
+    """
+    sock = environ.get('werkzeug.socket') or environ.get('gunicorn.socket')
+    if sock is None or not hasattr(socket, "MSG_DONTWAIT"):
+        return None
+    last_checked = [0.0]
+    disconnected = [False]
+
+    def probe() -> bool:
+        now = time.monotonic()
+        if disconnected[0] or now - last_checked[0] < POLL_INTERVAL_SECONDS:
+            return disconnected[0]
+        last_checked[0] = now
+        try:
+            disconnected[0] = sock.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+        except (BlockingIOError, InterruptedError):
+            disconnected[0] = False
+        except OSError:
+            disconnected[0] = True
+        return disconnected[0]
+
+    return probe
@@ -0,0 +1,311 @@
+import os
+import io
+import re
+import csv
+import sys
+import json
+import uuid
+import time
+import sqlite3
+import tempfile
+import threading
+
+__all__ = [
+    "HEADER_MAP",
+    "normalize_salary",
+    "iter_jobs_from_csv",
+    "DatasetStore",
+    "dataset_store",
+    "open_text_stream",
+]
+
+# --- Header Mapping ---
+# Mirrors HEADER_MAP in services/csvParser.ts so server-side ingestion produces the same Job shape.
+HEADER_MAP = {
+    'title': ['title', 'job title', 'role', 'position'],
+    'company': ['companyname', 'company_name', 'business_name', 'organization', 'company'],
+    'location': ['location', 'city', 'workplace', 'region'],
+    'description': ['description', 'job description', 'body', 'desc'],
+    'descriptionHtml': ['descriptionhtml', 'html description', 'description_html'],
+    'salary': ['salary', 'pay', 'compensation', 'rate'],
+    'applyUrl': ['applyurl', 'joburl', 'url', 'link', 'application link', 'apply_url'],
+    'applyType': ['applytype', 'apply_type', 'application_type', 'easy_apply'],
+    'id': ['job_id', 'jobid', 'id', 'ref'],
+
+    # Metadata
+    'applicants': ['applicationscount', 'applicants', 'num_applicants'],
+    'postedAt': ['postedtime', 'posted_time', 'posted at'],
+    'publishedAt': ['publishedat', 'published_at', 'date', 'publish_date'],
+}
+
+# Same truncation the browser parser applies to huge descriptions
+MAX_DESCRIPTION_CHARS = 5000
+# Rows are committed to the dataset store in chunks so memory stays flat for large exports
+INSERT_CHUNK_SIZE = 500
+# Datasets unused for DATASET_TTL_SECONDS are deleted (default: 3 days); every lookup extends the TTL
+DATASET_TTL_SECONDS = int(os.getenv("DATASET_TTL_SECONDS", str(3 * 24 * 3600)))
+
+# LinkedIn exports embed full HTML descriptions that blow past csv's default 128KB field limit
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
+_SALARY_NUMBER_RE = re.compile(r"(\d{1,3}(?:,\d{3})*(?:\.\d+)?)")
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_P_CLOSE_RE = re.compile(r"</p>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>?", re.MULTILINE)
+_WS_RE = re.compile(r"\s+")
+_EDGE_QUOTE_RE = re.compile(r'^"|"$')
+
+
+def normalize_salary(raw: str) -> str:
+    """Port of normalizeSalary from services/csvParser.ts (annual ranges become "$140k - $180k/yr")."""
+    if not raw:
+        return ''
+    lower = raw.lower()
+    # Skip formatting if it looks like hourly or monthly to avoid confusing $50k/hr
+    if 'hour' in lower or '/hr' in lower or 'mo' in lower or 'month' in lower:
+        return raw
+
+    numbers = []
+    for match in _SALARY_NUMBER_RE.findall(raw):
+        try:
+            numbers.append(float(match.replace(',', '')))
+        except ValueError:
+            continue
+
+    # Filter for likely annual salaries (heuristic: > 10,000)
+    annual = sorted(n for n in numbers if n > 10000)
+    if not annual:
+        return raw
+
+    def format_k(num: float) -> str:
+        # Math.round semantics (half up) rather than Python's banker's rounding
+        return f"${int(num / 1000 + 0.5)}k"
+
+    low, high = annual[0], annual[-1]
+    if low == high:
+        return f"{format_k(low)}/yr"
+    return f"{format_k(low)} - {format_k(high)}/yr"
+
+
+def _clean_description(desc: str) -> str:
+    if desc and ('<' in desc or '&lt;' in desc):
+        desc = _BR_RE.sub('\n', desc)
+        desc = _P_CLOSE_RE.sub('\n\n', desc)
+        desc = _TAG_RE.sub('', desc)
+        desc = desc.replace('&nbsp;', ' ')
+        desc = _WS_RE.sub(' ', desc).strip()
+    return desc
+
+
+def _resolve_indices(header_row: list) -> dict:
+    headers = [_EDGE_QUOTE_RE.sub('', h).strip().lower() for h in header_row]
+    indices = {}
+    for key, names in HEADER_MAP.items():
+        for name in names:
+            index = headers.index(name) if name in headers else -1
+            if index == -1:
+                # Loose match, but guard against 'companyId' matching 'company'
+                for i, h in enumerate(headers):
+                    if key == 'company' and 'id' in h:
+                        continue
+                    if name in h:
+                        index = i
+                        break
+            if index != -1:
+                indices[key] = index
+                break
+    return indices
+
+
+def iter_jobs_from_csv(text_stream):
+    """
+    Stream-parses a LinkedIn CSV export one row at a time and yields normalized job dicts
+    in the same shape services/csvParser.ts produces. Only the current row is held in memory.
+    """
+    reader = csv.reader(text_stream)
+    header_row = next(reader, None)
+    if not header_row:
+        return
+    indices = _resolve_indices(header_row)
+
+    for row in reader:
+        if len(row) <= 1 and (not row or not row[0].strip()):
+            continue
+
+        def get_val(key: str) -> str:
+            idx = indices.get(key)
+            if idx is not None and idx < len(row):
+                return _EDGE_QUOTE_RE.sub('', row[idx]).strip()
+            return ''
+
+        title = get_val('title') or 'Unknown Role'
+        company = get_val('company') or 'Unknown Company'
+        if title == 'Unknown Role' and company == 'Unknown Company':
+            continue
+
+        # Description Cleaning Logic: prefer the plain column, fall back to stripped HTML
+        desc = get_val('description')
+        if not desc and 'descriptionHtml' in indices:
+            desc = get_val('descriptionHtml')
+        desc = _clean_description(desc)
+
+        yield {
+            "id": get_val('id') or str(uuid.uuid4()),
+            "title": title,
+            "company": company,
+            "location": get_val('location') or 'Remote',
+            "description": desc[:MAX_DESCRIPTION_CHARS],
+            "salary": normalize_salary(get_val('salary')),
+            "applyUrl": get_val('applyUrl'),
+            "applyType": get_val('applyType'),
+            "applicants": get_val('applicants'),
+            "postedAt": get_val('postedAt'),
+            "publishedAt": get_val('publishedAt'),
+            "status": 'NEW',
+        }
+
+
+# --- Dataset Store ---
+class DatasetStore:
+    """
+    Keeps normalized jobs on disk (SQLite) under a dataset handle so evaluation endpoints can
+    reference jobs by position range or ID instead of re-uploading descriptions.
+    """
+
+    def __init__(self, path: str):
+        # Connections are opened per thread on first use, never at import (see shared_state.py)
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS datasets (
+                    dataset_id TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS dataset_jobs (
+                    dataset_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    job_id TEXT NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (dataset_id, seq)
+                );
+                CREATE INDEX IF NOT EXISTS idx_dataset_jobs_job_id ON dataset_jobs (dataset_id, job_id);
+                """
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _touch(self, dataset_id: str) -> bool:
+        """Extends a live dataset's expiry (sliding TTL); False for unknown or expired datasets."""
+        conn = self._conn()
+        updated = conn.execute(
+            "UPDATE datasets SET expires_at = ? WHERE dataset_id = ? AND expires_at >= ?",
+            (time.time() + DATASET_TTL_SECONDS, dataset_id, time.time()),
+        ).rowcount
+        conn.commit()
+        return updated > 0
+
+    def purge_expired(self) -> None:
+        """Deletes expired datasets, and jobs left over from datasets with no registry row."""
+        conn = self._conn()
+        conn.execute("DELETE FROM datasets WHERE expires_at < ?", (time.time(),))
+        conn.execute("DELETE FROM dataset_jobs WHERE dataset_id NOT IN (SELECT dataset_id FROM datasets)")
+        conn.commit()
+
+    def ingest(self, jobs) -> dict:
+        """Consumes a job iterator in fixed-size chunks and returns the new dataset handle."""
+        # Uploads are rare compared to lookups, so each one sweeps expired datasets first
+        self.purge_expired()
+        dataset_id = uuid.uuid4().hex
+        conn = self._conn()
+        conn.execute("INSERT INTO datasets VALUES (?, ?)", (dataset_id, time.time() + DATASET_TTL_SECONDS))
+        conn.commit()
+        count = 0
+        chunk = []
+        try:
+            for job in jobs:
+                chunk.append((dataset_id, count, str(job["id"]), json.dumps(job)))
+                count += 1
+                if len(chunk) >= INSERT_CHUNK_SIZE:
+                    conn.executemany("INSERT INTO dataset_jobs VALUES (?, ?, ?, ?)", chunk)
+                    conn.commit()
+                    chunk = []
+            if chunk:
+                conn.executemany("INSERT INTO dataset_jobs VALUES (?, ?, ?, ?)", chunk)
+                conn.commit()
+        except Exception:
+            # A failed upload (bad CSV row, dropped connection) must not leave a partial dataset
+            conn.rollback()
+            self.delete(dataset_id)
+            raise
+        return {"datasetId": dataset_id, "count": count, "expiresInSeconds": DATASET_TTL_SECONDS}
+
+    def exists(self, dataset_id: str) -> bool:
+        """True for a live dataset; like every read, it also extends the dataset's expiry."""
+        return self._touch(dataset_id)
+
+    def count(self, dataset_id: str) -> int:
+        if not self._touch(dataset_id):
+            return 0
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM dataset_jobs WHERE dataset_id = ?", (dataset_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_range(self, dataset_id: str, start: int, end: int) -> list:
+        """Returns jobs with position start <= seq < end, in upload order."""
+        return list(self.iter_range(dataset_id, start, end))
+
+    def iter_range(self, dataset_id: str, start: int, end: int):
+        """Yields jobs with position start <= seq < end in upload order, one page at a time."""
+        if not self._touch(dataset_id):
+            return
+        seq, end = max(0, int(start)), int(end)
+        while seq < end:
+            stop = min(seq + INSERT_CHUNK_SIZE, end)
+            rows = self._conn().execute(
+                "SELECT data FROM dataset_jobs WHERE dataset_id = ? AND seq >= ? AND seq < ? ORDER BY seq",
+                (dataset_id, seq, stop),
+            ).fetchall()
+            if not rows:
+                return
+            for (data,) in rows:
+                yield json.loads(data)
+            seq = stop
+
+    def iter_by_ids(self, dataset_id: str, job_ids: list):
+        """Yields jobs matching job_ids in the order the IDs were requested (unknown IDs are skipped)."""
+        if not self._touch(dataset_id):
+            return
+        for job_id in job_ids:
+            row = self._conn().execute(
+                "SELECT data FROM dataset_jobs WHERE dataset_id = ? AND job_id = ?",
+                (dataset_id, str(job_id)),
+            ).fetchone()
+            if row:
+                yield json.loads(row[0])
+
+    def delete(self, dataset_id: str) -> None:
+        conn = self._conn()
+        conn.execute("DELETE FROM datasets WHERE dataset_id = ?", (dataset_id,))
+        conn.execute("DELETE FROM dataset_jobs WHERE dataset_id = ?", (dataset_id,))
+        conn.commit()
+
+
+# Storage path is configurable via DATASET_DB_PATH (default: system temp dir)
+DATASET_DB_PATH = os.getenv(
+    "DATASET_DB_PATH", os.path.join(tempfile.gettempdir(), "safesubmit_datasets.sqlite3")
+)
+dataset_store = DatasetStore(DATASET_DB_PATH)
+
+
+def open_text_stream(binary_stream) -> io.TextIOWrapper:
+    """Wraps a binary upload stream for csv.reader (handles BOM-prefixed exports)."""
+    return io.TextIOWrapper(binary_stream, encoding="utf-8-sig", errors="replace", newline="")
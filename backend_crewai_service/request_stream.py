@@ -0,0 +1,249 @@
+import os
+import json
+import codecs
+from collections import deque
+
+__all__ = [
+    "NDJSON_MIMETYPES",
+    "RequestBodyTooLarge",
+    "StreamedBatch",
+]
+
+# --- Streamed Batch Bodies ---
+# Batch endpoints parse their body incrementally instead of via request.json, so jobs reach the
+# evaluation pipeline one at a time while the upload is still arriving. Two body formats:
+#   application/json       {"resumeText": ..., "userIntent": ..., ..., "jobs": [{...}, {...}]}
+#   application/x-ndjson   first line: the same object without "jobs"; then one job object per line
+# JSON bodies should send "jobs" as the last field. A field after it is only honoured while jobs
+# are still being buffered for a required field; once dispatch has started it is a 400, since the
+# jobs already evaluated never saw it.
+# - REQUEST_STREAM_MAX_BYTES: request-body characters held in memory at once per request (parse
+#   buffer, top-level fields and buffered jobs); exceeding it returns 413 (default: 16 MiB)
+# - REQUEST_STREAM_READ_BYTES: size of each read from the socket (default: 64 KiB)
+REQUEST_STREAM_MAX_BYTES = int(os.getenv("REQUEST_STREAM_MAX_BYTES", str(16 * 1024 * 1024)))
+REQUEST_STREAM_READ_BYTES = int(os.getenv("REQUEST_STREAM_READ_BYTES", str(64 * 1024)))
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_WHITESPACE = " \t\r\n"
+
+
+class RequestBodyTooLarge(ValueError):
+    pass
+
+
+class StreamedBatch:
+    """
+    Incremental parser for a batch request body. `header()` reads up to the first job and
+    returns the top-level fields; `jobs()` then yields the jobs as they are parsed off the stream.
+    """
+
+    def __init__(self, stream, mimetype: str = None, max_bytes: int = REQUEST_STREAM_MAX_BYTES):
+        self._stream = stream
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._max_bytes = max_bytes
+        self._held = 0  # characters of parsed fields and buffered jobs still in memory
+        self._pending = deque()  # (job, size) parsed ahead of dispatch
+        self._awaiting_fields = False
+        self._overflowed = False
+        self._dispatching = False
+        self._events = self._parse_ndjson() if mimetype in NDJSON_MIMETYPES else self._parse_json()
+        self.fields = {}
+
+    # --- Public API ---
+    def header(self, ready=None) -> dict:
+        """
+        Parses until the first job (or the end of the body) and returns the top-level fields.
+        If `ready(fields)` is given and returns False at that point, jobs are buffered until the
+        fields it needs arrive, within the memory limit. Past that limit the rest of the body is
+        read without keeping jobs: if the fields never arrive they are returned as-is so the
+        caller can report what is missing; if they arrive too late, RequestBodyTooLarge is raised.
+        """
+        self._awaiting_fields = ready is not None
+        for job, size in self._events:
+            self._buffer(job, size)
+            if ready is None or (not self._overflowed and ready(self.fields)):
+                break
+        self._awaiting_fields = False
+        if self._overflowed and ready(self.fields):
+            raise RequestBodyTooLarge(
+                f"Request body exceeds the {self._max_bytes} byte streaming limit before its "
+                "required fields. Put \"jobs\" last in the body or send fewer jobs per request."
+            )
+        return dict(self.fields)
+
+    @property
+    def has_jobs(self) -> bool:
+        return bool(self._pending)
+
+    def jobs(self):
+        """Yields every job in body order; call after header()."""
+        self._dispatching = True
+        while self._pending:
+            job, size = self._pending.popleft()
+            self._held -= size
+            yield job
+        for job, _ in self._events:
+            yield job
+
+    # --- Buffer Management ---
+    def _buffer(self, job, size: int) -> None:
+        if self._overflowed:
+            return
+        self._pending.append((job, size))
+        self._hold(size)
+
+    def _hold(self, size: int) -> None:
+        self._held += size
+        self._check_limit()
+
+    def _check_limit(self) -> None:
+        if self._in_memory() > self._max_bytes and self._awaiting_fields and self._pending:
+            # Drop the jobs buffered while waiting for fields; header() decides between 400 and 413
+            self._overflowed = True
+            self._held -= sum(size for _, size in self._pending)
+            self._pending.clear()
+        if self._in_memory() > self._max_bytes:
+            raise RequestBodyTooLarge(
+                f"Request body exceeds the {self._max_bytes} byte streaming limit. "
+                "Send fewer or shorter jobs per request, or put \"jobs\" last in the body."
+            )
+
+    def _in_memory(self) -> int:
+        return len(self._buf) - self._pos + self._held
+
+    def _fill(self) -> bool:
+        """Reads the next chunk into the buffer; returns False at end of body."""
+        if self._eof:
+            return False
+        chunk = self._stream.read(REQUEST_STREAM_READ_BYTES)
+        if not chunk:
+            self._eof = True
+            self._buf = self._buf[self._pos:] + self._decoder.decode(b"", final=True)
+        else:
+            self._buf = self._buf[self._pos:] + self._decoder.decode(chunk)
+        self._pos = 0
+        self._check_limit()
+        return True
+
+    def _peek(self):
+        """Skips whitespace and returns the next character without consuming it (None at end)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return None
+
+    def _expect(self, ch: str) -> None:
+        if self._peek() != ch:
+            raise ValueError(f"Malformed JSON request body: expected '{ch}'")
+        self._pos += 1
+
+    def _value(self):
+        """Decodes the next JSON value, reading more of the body until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise ValueError("Malformed JSON request body")
+                continue
+            # A value ending exactly at the buffer edge may be a number cut mid-chunk
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            size = end - self._pos
+            self._pos = end
+            return value, size
+
+    def _line(self):
+        """Returns the next NDJSON line without its newline, or None at end of body."""
+        while True:
+            newline = self._buf.find("\n", self._pos)
+            if newline != -1:
+                line = self._buf[self._pos:newline]
+                self._pos = newline + 1
+                return line
+            if not self._fill():
+                if self._pos >= len(self._buf):
+                    return None
+                line = self._buf[self._pos:]
+                self._pos = len(self._buf)
+                return line
+
+    # --- Parsers ---
+    def _emit(self, job, size: int):
+        if not isinstance(job, dict):
+            raise ValueError("Each job must be a JSON object")
+        return job, size
+
+    def _parse_json(self):
+        self._expect("{")
+        first = True
+        after_jobs = False
+        while self._peek() != "}":
+            if not first:
+                self._expect(",")
+            first = False
+            key, _ = self._value()
+            if not isinstance(key, str):
+                raise ValueError("Malformed JSON request body: expected a field name")
+            if after_jobs and self._dispatching:
+                raise ValueError(
+                    f"Field \"{key}\" arrived after \"jobs\", once evaluation had already started. "
+                    "Send every other field before \"jobs\"."
+                )
+            self._expect(":")
+            if key == "jobs" and self._peek() == "[":
+                self._pos += 1
+                yield from self._parse_jobs_array()
+                after_jobs = True
+                continue
+            value, size = self._value()
+            self.fields[key] = value
+            self._hold(size)
+        self._pos += 1
+        if self._peek() is not None:
+            raise ValueError("Malformed JSON request body: unexpected data after the top-level object")
+
+    def _parse_jobs_array(self):
+        first = True
+        while self._peek() != "]":
+            if self._peek() is None:
+                raise ValueError("Malformed JSON request body: unterminated jobs array")
+            if not first:
+                self._expect(",")
+            first = False
+            yield self._emit(*self._value())
+        self._pos += 1
+
+    def _parse_ndjson(self):
+        header = True
+        while True:
+            line = self._line()
+            if line is None:
+                return
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Malformed NDJSON request body: {e}")
+            if header:
+                if not isinstance(value, dict):
+                    raise ValueError("The first NDJSON line must be the request fields object")
+                header = False
+                inline_jobs = value.pop("jobs", None) or []
+                self.fields.update(value)
+                self._hold(len(line))
+                for job in inline_jobs:
+                    yield self._emit(job, 0)
+            else:
+                yield self._emit(value, len(line))
@@ -0,0 +1,124 @@
+import os
+import gzip
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional dependency: without it only gzip is offered
+    brotli = None
+
+__all__ = [
+    "COLUMNAR_MIMETYPE",
+    "COLUMNAR_FIELDS",
+    "wants_columnar",
+    "to_columnar",
+    "negotiate_encoding",
+    "compress_response",
+]
+
+# --- Response Compression ---
+# JSON and streamed JSONL responses are compressed per the client's Accept-Encoding: brotli
+# when the optional `brotli` package is installed and accepted, otherwise gzip.
+# - RESPONSE_COMPRESSION: "0"/"false" to send everything uncompressed (default: on)
+# - RESPONSE_COMPRESSION_MIN_BYTES: smaller non-streamed bodies are sent as-is (default: 1024)
+RESPONSE_COMPRESSION_ENABLED = os.getenv("RESPONSE_COMPRESSION", "true").lower() in ("1", "true", "yes")
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # well below the max (11): responses are compressed while the client waits
+
+# --- Columnar Batch Results ---
+# Sent only to clients that explicitly list this type in Accept (never matched by */*):
+# {"format": "columnar", "count": n, "columns": {"id": [...], "matchScore": [...], "visaRisk": [...]}}
+COLUMNAR_MIMETYPE = "application/vnd.safesubmit.columnar+json"
+COLUMNAR_FIELDS = ("id", "matchScore", "visaRisk")
+
+COMPRESSIBLE_MIMETYPES = {"application/json", COLUMNAR_MIMETYPE, "text/event-stream", "application/x-ndjson"}
+
+
+def wants_columnar(accept_mimetypes) -> bool:
+    return any(value == COLUMNAR_MIMETYPE and quality > 0 for value, quality in accept_mimetypes)
+
+
+def to_columnar(results: list) -> dict:
+    """Parallel arrays of COLUMNAR_FIELDS, one entry per result in order."""
+    return {
+        "format": "columnar",
+        "count": len(results),
+        "columns": {field: [r.get(field) for r in results] for field in COLUMNAR_FIELDS},
+    }
+
+
+def negotiate_encoding(accept_encodings):
+    """Best content coding the client accepts (werkzeug Accept object), or None for identity."""
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return accept_encodings.best_match(offered)
+
+
+class StreamCompressor:
+    """Incremental gzip/brotli encoder whose output is flushed after every chunk."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        # A sync flush ends each chunk on a byte boundary so the client can decode it right
+        # away; the shared window still lets repeated keys in later chunks compress away
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, GZIP_LEVEL)
+
+
+def compress_stream(chunks, encoding: str):
+    compressor = StreamCompressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        # Closing the wrapped generator is how the streaming endpoint learns the client is gone
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def compress_response(response, accept_encodings):
+    """Compresses a Flask response in place when its type and the client allow it."""
+    if not RESPONSE_COMPRESSION_ENABLED or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    if "Content-Encoding" in response.headers or response.status_code in (204, 304):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = negotiate_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        if len(body) < RESPONSE_COMPRESSION_MIN_BYTES:
+            return response
+        response.set_data(compress_bytes(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,150 @@
+import os
+import time
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+__all__ = [
+    "PRIORITY_INTERACTIVE",
+    "PRIORITY_BULK",
+    "LLMScheduler",
+    "llm_scheduler",
+]
+
+# --- Priority Classes ---
+# Interactive: a user is waiting on the response (panel creation, resume generation).
+# Bulk: batch job evaluation.
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BULK = "bulk"
+
+# - LLM_MAX_CONCURRENCY: LLM calls (or crew runs) in flight per worker process (default: 4)
+# - LLM_INTERACTIVE_RESERVED: slots bulk traffic may never take, kept free for interactive work (default: 1)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_INTERACTIVE_RESERVED = int(os.getenv("LLM_INTERACTIVE_RESERVED", "1"))
+
+_priority = ContextVar("llm_priority", default=PRIORITY_BULK)
+_session = ContextVar("llm_session", default="anonymous")
+
+
+class LLMScheduler:
+    """
+    Admits LLM work into a fixed number of slots. Interactive requests always go first and
+    bulk requests can only use the unreserved slots; within a class, waiting sessions are
+    served round-robin so one large batch cannot starve another user's batch.
+    """
+
+    def __init__(self, max_concurrency: int, interactive_reserved: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.interactive_reserved = min(max(0, interactive_reserved), self.max_concurrency - 1)
+        self._cond = threading.Condition()
+        self._active = 0
+        # class -> OrderedDict(session -> deque of waiting tickets); dict order is the round-robin order
+        self._queues = {PRIORITY_INTERACTIVE: OrderedDict(), PRIORITY_BULK: OrderedDict()}
+        self._stats = {
+            cls: {"admitted": 0, "totalWaitSeconds": 0.0, "maxWaitSeconds": 0.0}
+            for cls in self._queues
+        }
+
+    @contextmanager
+    def context(self, priority: str, session: str = None):
+        """Tags every LLM call made inside the block with a priority class and session key."""
+        priority_token = _priority.set(priority if priority in self._queues else PRIORITY_BULK)
+        session_token = _session.set(session or "anonymous")
+        try:
+            yield
+        finally:
+            _priority.reset(priority_token)
+            _session.reset(session_token)
+
+    def _capacity(self, cls: str) -> int:
+        if cls == PRIORITY_INTERACTIVE:
+            return self.max_concurrency
+        return self.max_concurrency - self.interactive_reserved
+
+    def _can_admit(self, ticket, cls: str) -> bool:
+        if self._active >= self._capacity(cls):
+            return False
+        if cls == PRIORITY_BULK and self._queues[PRIORITY_INTERACTIVE]:
+            return False
+        sessions = self._queues[cls]
+        head_session = next(iter(sessions))
+        return sessions[head_session][0] is ticket
+
+    def _dequeue(self, cls: str, session: str) -> None:
+        sessions = self._queues[cls]
+        sessions[session].popleft()
+        if sessions[session]:
+            sessions.move_to_end(session)
+        else:
+            del sessions[session]
+
+    def _abandon(self, ticket, cls: str, session: str) -> None:
+        queue = self._queues[cls].get(session)
+        if queue is not None:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[cls][session]
+        self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, check=None):
+        """
+        Blocks until the current context's class/session is next in line, then holds a slot.
+        `check` is called while waiting; if it raises, the ticket leaves the queue and the
+        exception propagates (used for request deadlines and client disconnects).
+        """
+        cls, session = _priority.get(), _session.get()
+        ticket = object()
+        queued_at = time.monotonic()
+        with self._cond:
+            self._queues[cls].setdefault(session, deque()).append(ticket)
+            while not self._can_admit(ticket, cls):
+                self._cond.wait(timeout=0.5 if check else None)
+                if check:
+                    try:
+                        check()
+                    except BaseException:
+                        self._abandon(ticket, cls, session)
+                        raise
+            self._dequeue(cls, session)
+            self._active += 1
+            waited = time.monotonic() - queued_at
+            stats = self._stats[cls]
+            stats["admitted"] += 1
+            stats["totalWaitSeconds"] += waited
+            stats["maxWaitSeconds"] = max(stats["maxWaitSeconds"], waited)
+            # Admission may unblock the next session in line
+            self._cond.notify_all()
+        if waited > 1:
+            print(f"[Scheduler] {cls} call for session {session} waited {waited:.1f}s in queue")
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def current_priority(self) -> str:
+        return _priority.get()
+
+    def stats(self) -> dict:
+        with self._cond:
+            classes = {}
+            for cls, stats in self._stats.items():
+                admitted = stats["admitted"]
+                classes[cls] = {
+                    "admitted": admitted,
+                    "waiting": sum(len(q) for q in self._queues[cls].values()),
+                    "avgWaitSeconds": round(stats["totalWaitSeconds"] / admitted, 3) if admitted else 0.0,
+                    "maxWaitSeconds": round(stats["maxWaitSeconds"], 3),
+                }
+            return {
+                "active": self._active,
+                "maxConcurrency": self.max_concurrency,
+                "interactiveReserved": self.interactive_reserved,
+                "classes": classes,
+            }
+
+
+llm_scheduler = LLMScheduler(LLM_MAX_CONCURRENCY, LLM_INTERACTIVE_RESERVED)
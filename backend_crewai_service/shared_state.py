@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import tempfile
+import threading
+
+__all__ = [
+    "SharedState",
+    "shared_state",
+    "content_hash",
+]
+
+# --- Shared State ---
+# Every gunicorn worker on a node opens the same SQLite file (WAL mode), so rate-limit counters,
+# result/panel caches and batch status are shared across processes without an external service.
+# - SHARED_STATE_DB_PATH: SQLite file (default: system temp dir)
+# - RESULT_CACHE_TTL_SECONDS: lifetime of cached evaluation results and panels (default: 24h)
+# - BATCH_STATUS_TTL_SECONDS: how long finished/abandoned batch status stays queryable (default: 24h)
+SHARED_STATE_DB_PATH = os.getenv(
+    "SHARED_STATE_DB_PATH", os.path.join(tempfile.gettempdir(), "safesubmit_shared_state.sqlite3")
+)
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", str(24 * 3600)))
+BATCH_STATUS_TTL_SECONDS = int(os.getenv("BATCH_STATUS_TTL_SECONDS", str(24 * 3600)))
+
+# Expired rows are deleted by whichever write happens to draw this chance, so no process
+# needs a background sweeper and the purge cost is spread thinly over normal traffic
+PURGE_PROBABILITY = 0.01
+
+
+def content_hash(*parts) -> str:
+    """Stable SHA-256 over JSON-serialized parts, used as a cache key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class SharedState:
+    def __init__(self, path: str):
+        # No connection is opened here: the module-level instance is created at import, which
+        # under `gunicorn --preload` happens before workers fork, and SQLite connections must
+        # not be carried across fork()
+        self.path = path
+        self._local = threading.local()
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE TABLE IF NOT EXISTS rate_windows (
+                bucket TEXT NOT NULL,
+                window_start INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (bucket, window_start)
+            );
+            CREATE TABLE IF NOT EXISTS batch_status (
+                batch_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread, opened on first use; SQLite serializes writers across
+        # processes via file locks. A connection inherited through fork() is never reused.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._create_schema(conn)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    # --- Caches ---
+    def cache_get(self, namespace: str, key: str):
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if not row or row[1] < time.time():
+            return None
+        return json.loads(row[0])
+
+    def cache_set(self, namespace: str, key: str, value, ttl: int = RESULT_CACHE_TTL_SECONDS) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), time.time() + ttl),
+        )
+        self._maybe_purge()
+
+    def cache_delete(self, namespace: str, key: str) -> None:
+        self._conn().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def cache_purge_expired(self) -> None:
+        self._conn().execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+
+    def purge_expired(self) -> None:
+        """Drops expired cache entries and batch status not updated within BATCH_STATUS_TTL_SECONDS."""
+        self.cache_purge_expired()
+        self._conn().execute("DELETE FROM batch_status WHERE updated_at < ?", (time.time() - BATCH_STATUS_TTL_SECONDS,))
+
+    def _maybe_purge(self) -> None:
+        if random.random() < PURGE_PROBABILITY:
+            self.purge_expired()
+
+    # --- Rate Limiting ---
+    def try_acquire(self, bucket: str, limit: int, cost: int = 1, window_seconds: int = 60) -> bool:
+        """
+        Fixed-window counter shared by every process using this file. Returns True and records
+        `cost` units when the bucket has room in the current window, False otherwise.
+        """
+        if limit <= 0:
+            return True
+        window_start = int(time.time() // window_seconds) * window_seconds
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT count FROM rate_windows WHERE bucket = ? AND window_start = ?", (bucket, window_start)
+            ).fetchone()
+            used = row[0] if row else 0
+            if used + cost > limit and used > 0:
+                conn.execute("COMMIT")
+                return False
+            conn.execute(
+                "INSERT INTO rate_windows VALUES (?, ?, ?) "
+                "ON CONFLICT(bucket, window_start) DO UPDATE SET count = count + excluded.count",
+                (bucket, window_start, cost),
+            )
+            conn.execute("DELETE FROM rate_windows WHERE bucket = ? AND window_start < ?", (bucket, window_start))
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def acquire(self, bucket: str, limit: int, cost: int = 1, window_seconds: int = 60, max_wait: float = 120.0, check=None) -> None:
+        """
+        Blocks until try_acquire succeeds; raises ValueError (rate limit) after max_wait seconds.
+        `check` is called while waiting and before giving up; whatever it raises propagates
+        (used for request deadlines and client disconnects, as in LLMScheduler.slot).
+        """
+        deadline = time.time() + max_wait
+        while not self.try_acquire(bucket, limit, cost, window_seconds):
+            if check:
+                check()
+            if time.time() >= deadline:
+                raise ValueError(
+                    "Gemini API rate limit reached. Please wait a moment or reduce your batch size."
+                )
+            time.sleep(max(0.01, min(1.0, window_seconds - time.time() % window_seconds, deadline - time.time())))
+
+    # --- Batch Status ---
+    def set_batch_status(self, batch_id: str, **status) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT status FROM batch_status WHERE batch_id = ?", (batch_id,)).fetchone()
+            merged = {**(json.loads(row[0]) if row else {}), **status}
+            conn.execute(
+                "INSERT OR REPLACE INTO batch_status VALUES (?, ?, ?)",
+                (batch_id, json.dumps(merged), time.time()),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._maybe_purge()
+
+    def get_batch_status(self, batch_id: str):
+        row = self._conn().execute(
+            "SELECT status, updated_at FROM batch_status WHERE batch_id = ?", (batch_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return {**json.loads(row[0]), "batchId": batch_id, "updatedAt": row[1]}
+
+
+shared_state = SharedState(SHARED_STATE_DB_PATH)
@@ -0,0 +1,182 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+__all__ = [
+    "SKILL_VOCABULARY",
+    "QUALIFIED_SKILLS",
+    "SkillMatcher",
+    "skill_matcher",
+    "extract_resume_skills",
+    "compute_skill_features",
+]
+
+# --- Skill Vocabulary ---
+# Canonical skill name -> aliases as they appear in resumes/postings (matched case-insensitively
+# on word boundaries). The canonical name is matched as well, so ambiguous short names ("Go",
+# "R") carry a qualifier and are only found through their aliases. Aliases must not be
+# everyday English ("monitoring", "roadmap", "leadership"): a false hit becomes a "missing
+# must-have" in the prompt and skews skillCoverage.
+SKILL_VOCABULARY = {
+    # Languages
+    "Python": [], "Java": [], "JavaScript": ["js", "ecmascript"], "TypeScript": [],
+    "Go (Golang)": ["golang"], "Rust": ["rustlang", "rust programming", "rust language", "rust developer"], "C++": ["cpp"], "C#": ["csharp", ".net", "dotnet"],
+    "Ruby": [], "PHP": [], "Scala": [], "Kotlin": [], "Swift": ["swiftui", "swift/ios", "ios/swift", "swift programming", "swift language", "swift developer"], "R (language)": ["r programming", "rstudio"], "SQL": [],
+    "Bash": ["shell scripting", "bash scripting", "bash/shell", "shell/bash", "bash scripts"],
+    # Frontend
+    "React": ["react.js", "reactjs", "react native", "react/redux", "react hooks", "react components"], "Angular": [], "Vue": ["vue.js", "vuejs"], "Next.js": ["nextjs"],
+    "HTML": ["html5"], "CSS": ["css3", "tailwind", "sass"], "Redux": [],
+    # Backend / frameworks
+    "Node.js": ["nodejs"], "Django": [], "Flask": [], "FastAPI": [], "Spring": ["spring boot", "spring framework", "spring mvc", "spring cloud", "java/spring", "java spring"],
+    "Rails": ["ruby on rails", "rails framework", "ruby/rails"], "GraphQL": [], "REST": ["restful", "rest api", "rest apis", "rest services", "rest endpoints", "rest/graphql"], "gRPC": [],
+    "Microservices": ["microservice"],
+    # Data
+    "PostgreSQL": ["postgres"], "MySQL": [], "MongoDB": ["mongo"], "Redis": [], "Elasticsearch": [],
+    "Kafka": [], "Spark": ["pyspark", "apache spark", "spark sql", "spark streaming"], "Airflow": ["apache airflow"], "Snowflake": ["snowflake sql", "snowflake data warehouse", "snowpark"], "BigQuery": [],
+    "dbt": [], "Hadoop": [], "ETL": ["elt", "data pipelines", "data pipeline"], "Tableau": [],
+    "Power BI": ["powerbi"], "Looker": [], "Excel": ["microsoft excel", "ms excel", "advanced excel", "excel vba", "excel/vba", "excel spreadsheets", "pivot tables"],
+    # ML / AI
+    "Machine Learning": ["ml"], "Deep Learning": [], "NLP": ["natural language processing"],
+    "Computer Vision": [], "PyTorch": [], "TensorFlow": [], "scikit-learn": ["sklearn"],
+    "LLM": ["llms", "large language models", "generative ai", "genai"], "Statistics": ["statistical analysis", "statistical modeling"],
+    "A/B Testing": ["ab testing", "a/b tests"], "Pandas": [], "NumPy": [],
+    # Cloud / infra
+    "AWS": ["amazon web services"], "GCP": ["google cloud"], "Azure": [], "Docker": [],
+    "Kubernetes": ["k8s"], "Terraform": [], "CI/CD": ["continuous integration", "continuous delivery"], "Linux": [],
+    "Git": [], "Jenkins": [], "Observability": ["prometheus", "grafana", "datadog"],
+    # Product / process
+    "Product Management": ["product manager", "product strategy", "product roadmap"], "Agile": ["scrum", "kanban"],
+    "Jira": [], "Stakeholder Management": [], "Figma": [],
+    "UX Research": ["user research"], "Data Analysis": ["data analytics"],
+    "Go-to-Market": ["gtm", "go to market"], "People Management": ["people leadership", "managed a team", "direct reports"],
+    "System Design": ["distributed systems"], "Information Security": ["cybersecurity", "infosec", "application security"],
+    "Salesforce": [], "SEO": [],
+}
+
+# Canonical names that are also ordinary words ("Excel at", "This Spring", "Swift execution")
+# are not matched on their own, whatever the capitalization: like Go and R, they are only found
+# through a qualified alias ("Microsoft Excel", "Spring Boot", "SwiftUI").
+QUALIFIED_SKILLS = {"Swift", "Rust", "Bash", "React", "Spring", "Rails", "REST", "Spark", "Airflow", "Snowflake", "Excel"}
+
+# Lines/sentences carrying these markers list nice-to-haves rather than must-haves, unless they
+# also say the skill is required ("Familiarity with Docker is required")
+_NICE_TO_HAVE_RE = re.compile(r"\b(?:preferred|nice[- ]to[- ]have|bonus|a plus|is a plus|desirable|ideally|familiarity)\b", re.IGNORECASE)
+_MUST_HAVE_RE = re.compile(r"\b(?:required|must|mandatory|essential)\b", re.IGNORECASE)
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+|\n+")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill vocabulary. A single left-to-right pass over a text
+    reports every alias occurrence; matches are kept only on word boundaries so "Java" does not
+    fire inside "JavaScript" and "ml" does not fire inside "html".
+    """
+
+    def __init__(self, vocabulary: dict, qualified: set = frozenset()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # node -> [(alias_length, canonical)]
+        for canonical, aliases in vocabulary.items():
+            patterns = {a.lower() for a in aliases}
+            if canonical not in qualified:
+                patterns.add(canonical.lower())
+            for pattern in patterns:
+                self._add(pattern, canonical)
+        self._build()
+
+    def _add(self, pattern: str, canonical: str) -> None:
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append((len(pattern), canonical))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yields (start, end, canonical) for each word-bounded alias occurrence in text."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two; keep offsets aligned with the original text
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        node = 0
+        for i, ch in enumerate(lowered):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for length, canonical in self._out[node]:
+                start = i - length + 1
+                if start > 0 and _is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]):
+                    continue
+                if i + 1 < len(lowered) and _is_word_char(lowered[i + 1]) and _is_word_char(lowered[i]):
+                    continue
+                yield start, i + 1, canonical
+
+    def extract(self, text: str) -> set:
+        """Canonical skills in text; an alias inside a longer one ("js" in "node.js") is dropped."""
+        found, covered_to = set(), 0
+        for start, end, canonical in sorted(self.iter_matches(text or ""), key=lambda m: (m[0], -m[1])):
+            if end <= covered_to:
+                continue
+            found.add(canonical)
+            covered_to = end
+        return found
+
+    def extract_requirements(self, text: str) -> tuple:
+        """Splits skills found in a job description into (must_have, nice_to_have) sets."""
+        must, nice = set(), set()
+        for sentence in _SENTENCE_SPLIT_RE.split(text or ""):
+            found = self.extract(sentence)
+            optional = _NICE_TO_HAVE_RE.search(sentence) and not _MUST_HAVE_RE.search(sentence)
+            (nice if optional else must).update(found)
+        return must, nice - must
+
+
+skill_matcher = SkillMatcher(SKILL_VOCABULARY, QUALIFIED_SKILLS)
+
+
+@lru_cache(maxsize=64)
+def extract_resume_skills(resume_text: str) -> frozenset:
+    """Resume skills are extracted once per distinct resume and reused across every job."""
+    return frozenset(skill_matcher.extract(resume_text))
+
+
+def compute_skill_features(resume_text: str, jobs: list) -> dict:
+    """
+    Returns {job_id: {"matchedSkills", "missingSkills", "niceToHaveSkills", "skillCoverage"}}
+    where missingSkills are must-haves absent from the resume and skillCoverage is the
+    0-100 share of must-haves the resume covers (None when the posting names none).
+    """
+    resume_skills = extract_resume_skills(resume_text or "")
+    features = {}
+    for job in jobs:
+        must, nice = skill_matcher.extract_requirements(job.get("description") or "")
+        matched = sorted(must & resume_skills)
+        missing = sorted(must - resume_skills)
+        features[str(job.get("id"))] = {
+            "matchedSkills": matched,
+            "missingSkills": missing,
+            "niceToHaveSkills": sorted(nice),
+            "skillCoverage": round(100 * len(matched) / len(must)) if must else None,
+        }
+    return features
@@ -0,0 +1,148 @@
+"""Offline checks for the streamed batch body parser (no Flask or network needed).
+
+Run with: python -m unittest test_request_stream
+"""
+
+import io
+import json
+import unittest
+
+from request_stream import RequestBodyTooLarge, StreamedBatch
+
+FIELDS = {"resumeText": "Python developer", "userIntent": "backend roles"}
+JOBS = [{"id": "1", "title": "Backend Engineer"}, {"id": "2", "title": "Data Engineer"}]
+
+
+def ready(fields):
+    return all(fields.get(k) for k in FIELDS)
+
+
+class TrickleStream:
+    """Returns at most `step` bytes per read, like a slow upload arriving in small packets."""
+
+    def __init__(self, data: bytes, step: int = 1):
+        self._data = io.BytesIO(data)
+        self._step = step
+
+    def read(self, size: int) -> bytes:
+        return self._data.read(min(size, self._step))
+
+
+def parse(body: str, mimetype: str = "application/json", step: int = 1, **kwargs):
+    batch = StreamedBatch(TrickleStream(body.encode("utf-8"), step), mimetype, **kwargs)
+    fields = batch.header(ready)
+    return fields, list(batch.jobs())
+
+
+class JsonBodyTest(unittest.TestCase):
+    def test_jobs_last(self):
+        fields, jobs = parse(json.dumps({**FIELDS, "jobs": JOBS}))
+        self.assertEqual(fields, FIELDS)
+        self.assertEqual(jobs, JOBS)
+
+    def test_jobs_first_buffers_until_required_fields(self):
+        fields, jobs = parse(json.dumps({"jobs": JOBS, **FIELDS}))
+        self.assertEqual(fields, FIELDS)
+        self.assertEqual(jobs, JOBS)
+
+    def test_no_jobs(self):
+        batch = StreamedBatch(TrickleStream(json.dumps({**FIELDS, "datasetId": "d1"}).encode()), "application/json")
+        self.assertEqual(batch.header(ready)["datasetId"], "d1")
+        self.assertFalse(batch.has_jobs)
+
+    def test_numbers_split_across_reads(self):
+        # With 1-byte reads "12345" is first seen as "1"; it must not be decoded early
+        body = json.dumps({**FIELDS, "deadlineSeconds": 12345, "jobs": [{"id": "1", "salary": 98765.5}]})
+        fields, jobs = parse(body)
+        self.assertEqual(fields["deadlineSeconds"], 12345)
+        self.assertEqual(jobs[0]["salary"], 98765.5)
+
+    def test_multibyte_utf8_split_across_reads(self):
+        jobs = [{"id": "1", "title": "Ingénieur logiciel 🚀", "company": "Zürich AG"}]
+        body = json.dumps({**FIELDS, "jobs": jobs}, ensure_ascii=False)
+        for step in (1, 2, 3):
+            with self.subTest(step=step):
+                self.assertEqual(parse(body, step=step)[1], jobs)
+
+    def test_trailing_garbage(self):
+        body = json.dumps({**FIELDS, "jobs": JOBS}) + " garbage"
+        with self.assertRaisesRegex(ValueError, "unexpected data after the top-level object"):
+            parse(body)
+
+    def test_job_must_be_object(self):
+        with self.assertRaisesRegex(ValueError, "Each job must be a JSON object"):
+            parse(json.dumps({**FIELDS, "jobs": ["not a job"]}))
+
+    def test_truncated_body(self):
+        body = json.dumps({**FIELDS, "jobs": JOBS})[:-10]
+        with self.assertRaises(ValueError):
+            parse(body)
+
+
+class MemoryLimitTest(unittest.TestCase):
+    BIG_JOBS = [{"id": str(i), "description": "x" * 100} for i in range(10)]
+
+    def test_required_fields_never_arrive_is_not_too_large(self):
+        # The caller reports the missing fields as a 400, not a 413
+        body = json.dumps({"userIntent": "backend roles", "jobs": self.BIG_JOBS})
+        fields, jobs = parse(body, max_bytes=400)
+        self.assertFalse(ready(fields))
+        self.assertEqual(jobs, [])
+
+    def test_required_fields_after_limit_is_too_large(self):
+        body = json.dumps({"jobs": self.BIG_JOBS, **FIELDS})
+        with self.assertRaises(RequestBodyTooLarge):
+            parse(body, max_bytes=400)
+
+    def test_streamed_jobs_are_not_held(self):
+        # Jobs sent after their fields are dispatched one at a time, so the total can exceed the limit
+        fields, jobs = parse(json.dumps({**FIELDS, "jobs": self.BIG_JOBS}), max_bytes=400)
+        self.assertEqual(jobs, self.BIG_JOBS)
+
+    def test_single_oversized_field(self):
+        body = json.dumps({**FIELDS, "instructions": "x" * 1000, "jobs": JOBS})
+        with self.assertRaises(RequestBodyTooLarge):
+            parse(body, max_bytes=400)
+
+
+class NdjsonBodyTest(unittest.TestCase):
+    def test_header_line_then_jobs(self):
+        body = "\n".join(json.dumps(line) for line in [FIELDS, *JOBS]) + "\n"
+        fields, jobs = parse(body, mimetype="application/x-ndjson")
+        self.assertEqual(fields, FIELDS)
+        self.assertEqual(jobs, JOBS)
+
+    def test_blank_lines_and_missing_final_newline(self):
+        body = json.dumps(FIELDS) + "\n\n" + json.dumps(JOBS[0]) + "\r\n\n" + json.dumps(JOBS[1])
+        self.assertEqual(parse(body, mimetype="application/x-ndjson")[1], JOBS)
+
+    def test_inline_jobs_in_header(self):
+        body = json.dumps({**FIELDS, "jobs": JOBS[:1]}) + "\n" + json.dumps(JOBS[1])
+        self.assertEqual(parse(body, mimetype="application/x-ndjson")[1], JOBS)
+
+    def test_header_must_be_object(self):
+        with self.assertRaisesRegex(ValueError, "first NDJSON line"):
+            parse(json.dumps(JOBS) + "\n", mimetype="application/x-ndjson")
+
+    def test_malformed_line(self):
+        body = json.dumps(FIELDS) + "\n" + json.dumps(JOBS[0]) + "\n{broken\n"
+        with self.assertRaisesRegex(ValueError, "Malformed NDJSON"):
+            parse(body, mimetype="application/x-ndjson")
+
+
+class FieldsAfterJobsTest(unittest.TestCase):
+    def test_field_after_jobs_rejected_once_dispatching(self):
+        body = json.dumps({**FIELDS, "jobs": JOBS, "cascade": True})
+        with self.assertRaisesRegex(ValueError, '"cascade" arrived after "jobs"'):
+            parse(body)
+
+    def test_field_after_jobs_honoured_while_buffering(self):
+        # resumeText is required, so jobs are buffered until it arrives and nothing has run yet
+        body = json.dumps({"userIntent": "backend roles", "jobs": JOBS, "resumeText": "Python developer"})
+        fields, jobs = parse(body)
+        self.assertEqual(fields["resumeText"], "Python developer")
+        self.assertEqual(jobs, JOBS)
+
+
+if __name__ == "__main__":
+    unittest.main()
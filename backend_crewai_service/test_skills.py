@@ -0,0 +1,76 @@
+"""Offline checks for the skill matcher (no API key or network needed).
+
+Run with: python -m unittest test_skills
+"""
+
+import unittest
+
+from skills import SkillMatcher, compute_skill_features, skill_matcher
+
+
+class SkillMatcherTest(unittest.TestCase):
+    def test_word_boundaries(self):
+        self.assertEqual(skill_matcher.extract("JavaScript and HTML5"), {"JavaScript", "HTML"})
+        self.assertEqual(skill_matcher.extract("Java, Python"), {"Java", "Python"})
+        self.assertEqual(skill_matcher.extract("xml parsing"), set())
+
+    def test_aliases_map_to_canonical(self):
+        self.assertEqual(skill_matcher.extract("k8s, postgres and golang"), {"Kubernetes", "PostgreSQL", "Go (Golang)"})
+
+    def test_overlapping_aliases(self):
+        # "react native" and "native" share a suffix; both ends of an alias must sit on a boundary
+        self.assertEqual(skill_matcher.extract("Built apps in React Native."), {"React"})
+        self.assertEqual(skill_matcher.extract("TypeScript/Node.js"), {"TypeScript", "Node.js"})
+
+    def test_case_insensitive(self):
+        self.assertEqual(skill_matcher.extract("PYTHON, docker, KubeRnetes"), {"Python", "Docker", "Kubernetes"})
+
+    def test_everyday_words_are_not_skills(self):
+        text = "Excel at communication. This Spring we launch. Swift execution required. The rest is up to you. Go team!"
+        self.assertEqual(skill_matcher.extract(text), set())
+
+    def test_qualified_aliases(self):
+        text = "Microsoft Excel, Spring Boot, SwiftUI, REST APIs and Apache Airflow"
+        self.assertEqual(skill_matcher.extract(text), {"Excel", "Spring", "Swift", "REST", "Airflow"})
+
+    def test_qualified_canonical_not_matched(self):
+        matcher = SkillMatcher({"Spring": ["spring boot"], "Python": []}, qualified={"Spring"})
+        self.assertEqual(matcher.extract("Python in spring"), {"Python"})
+        self.assertEqual(matcher.extract("Spring Boot services"), {"Spring"})
+
+
+class RequirementsTest(unittest.TestCase):
+    def test_must_and_nice_split(self):
+        text = "Requirements: Python and SQL.\nKubernetes experience is a plus.\nNice to have: Terraform"
+        must, nice = skill_matcher.extract_requirements(text)
+        self.assertEqual(must, {"Python", "SQL"})
+        self.assertEqual(nice, {"Kubernetes", "Terraform"})
+
+    def test_required_overrides_nice_marker(self):
+        must, nice = skill_matcher.extract_requirements("Familiarity with Docker is required.")
+        self.assertEqual((must, nice), ({"Docker"}, set()))
+        must, nice = skill_matcher.extract_requirements("Familiarity with Docker.")
+        self.assertEqual((must, nice), (set(), {"Docker"}))
+
+    def test_must_wins_over_nice_across_sentences(self):
+        must, nice = skill_matcher.extract_requirements("You must know Python. Python 3.12 preferred.")
+        self.assertEqual((must, nice), ({"Python"}, set()))
+
+
+class SkillFeaturesTest(unittest.TestCase):
+    def test_coverage(self):
+        jobs = [
+            {"id": 1, "description": "Must have Python, Docker and AWS. Terraform is a plus."},
+            {"id": "2", "description": "Excel at communication. Swift execution required."},
+        ]
+        features = compute_skill_features("Python developer with Docker and Terraform", jobs)
+        self.assertEqual(features["1"]["matchedSkills"], ["Docker", "Python"])
+        self.assertEqual(features["1"]["missingSkills"], ["AWS"])
+        self.assertEqual(features["1"]["niceToHaveSkills"], ["Terraform"])
+        self.assertEqual(features["1"]["skillCoverage"], 67)
+        self.assertEqual(features["2"]["missingSkills"], [])
+        self.assertIsNone(features["2"]["skillCoverage"])
+
+
+if __name__ == "__main__":
+    unittest.main()
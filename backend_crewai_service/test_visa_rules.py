@@ -0,0 +1,94 @@
+"""Offline checks for the visa phrase rules (no API key or network needed).
+
+Run with: python -m unittest test_visa_rules
+"""
+
+import unittest
+
+from visa_rules import classify_visa_risk, is_visa_agent
+
+HIGH = [
+    "We are unable to sponsor visas for this position.",
+    "No visa sponsorship is available.",
+    "Sponsorship is not available for this role.",
+    "Sponsorship: Not available",
+    "Visa sponsorship: No",
+    "We will not be sponsoring visas at this time.",
+    "We will not be sponsoring",
+    "We do not sponsor H-1B visas.",
+    "Candidates must be authorized to work in the US.",
+    "You must be legally authorized to work in the United States without sponsorship now or in the future.",
+    "Applicants requiring visa sponsorship will not be considered.",
+    "US citizens only.",
+    "U.S. citizenship is required.",
+    "An active security clearance is required.",
+    "Green card holders only.",
+    "No relocation or visa sponsorship.",
+    "We do not sponsor relocation. We cannot sponsor work visas either.",
+]
+
+LOW = [
+    "H-1B sponsorship available.",
+    "Sponsorship: Available",
+    "Visa sponsorship: Yes",
+    "We will sponsor visas for the right candidate.",
+    "We will be sponsoring H-1B visas for this team.",
+    "We are happy to sponsor.",
+    "We offer visa sponsorship and relocation.",
+    "H1B transfers welcome.",
+    "We don't offer relocation. Sponsorship is available.",
+    "We do not sponsor relocation, but we will sponsor H-1B visas.",
+]
+
+AMBIGUOUS = [
+    None,
+    "",
+    "Great benefits and a collaborative team.",
+    "This role does not require sponsorship.",
+    "This position does not currently require visa sponsorship.",
+    "Sponsorship may be considered for exceptional candidates.",
+    # Sponsoring something other than a visa
+    "We will sponsor your AWS certification.",
+    "We are happy to sponsor relocation.",
+    "We do not sponsor relocation.",
+    "No relocation sponsorship.",
+    "We can sponsor continuing education and conference travel.",
+    "We will sponsor the right candidate.",
+    # Conflicting signals are left to the LLM
+    "We cannot sponsor H-1B visas, but TN sponsorship is available.",
+]
+
+
+class ClassifyVisaRiskTest(unittest.TestCase):
+    def test_high(self):
+        for text in HIGH:
+            with self.subTest(text=text):
+                result = classify_visa_risk(text)
+                self.assertIsNotNone(result)
+                self.assertEqual(result["visaRisk"], "HIGH")
+
+    def test_low(self):
+        for text in LOW:
+            with self.subTest(text=text):
+                result = classify_visa_risk(text)
+                self.assertIsNotNone(result)
+                self.assertEqual(result["visaRisk"], "LOW")
+
+    def test_ambiguous(self):
+        for text in AMBIGUOUS:
+            with self.subTest(text=text):
+                self.assertIsNone(classify_visa_risk(text))
+
+    def test_evidence_names_matched_rules(self):
+        result = classify_visa_risk("Sponsorship is not available. Must be authorized to work in the US.")
+        self.assertEqual(result["evidence"], ["sponsorship not available", "must be authorized"])
+
+
+class IsVisaAgentTest(unittest.TestCase):
+    def test_visa_lens(self):
+        self.assertTrue(is_visa_agent({"name": "Ivy", "role": "Immigration Specialist", "focus": "work authorization"}))
+        self.assertFalse(is_visa_agent({"name": "Sam", "role": "Hiring Manager", "focus": "overall fit"}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import re
+
+__all__ = [
+    "classify_visa_risk",
+    "is_visa_agent",
+]
+
+# --- Visa Phrase Rules ---
+# Explicit sponsorship language found in postings. Each rule is (label, pattern); patterns are
+# compiled once at import and matched case-insensitively against the plain-text description.
+# Only explicit signals are encoded here; anything ambiguous is left to the LLM (MEDIUM/unclear).
+_HIGH_RULES = [
+    # "does not (currently) require sponsorship" says nothing about whether the employer sponsors
+    ("no sponsorship", r"\b(?:(?:no|not)\s+(?!(?:\w+\s+)?(?:require[sd]?|requiring|needs?|needed)\b)|without\s+)(?:\w+\s+){0,3}(?:visa\s+|immigration\s+|h-?1b\s+)?sponsorship\b"),
+    ("unable to sponsor", r"\b(?:unable|not able|cannot|can\s*not|can't|won't|will not|does not|do not|doesn't|don't|is not able)\s+(?:to\s+)?(?:\w+\s+){0,2}sponsor(?:ing)?\b"),
+    ("sponsorship not available", r"\bsponsorship\s*[:\-\u2013]?\s*(?:is\s+)?(?:not|un)\s*(?:available|offered|provided|possible|supported)\b|\bsponsorship\s*:\s*(?:no|none)\b"),
+    ("sponsorship applicants not considered", r"\b(?:requir\w*|need\w*)\s+(?:\w+\s+){0,3}sponsorship\b[^.]{0,60}\b(?:not|cannot|won't)\s+(?:be\s+)?(?:considered|eligible|accepted)\b"),
+    ("must be authorized", r"\bmust\s+(?:be\s+)?(?:legally\s+)?(?:authorized|eligible|permitted)\s+to\s+work\b"),
+    ("authorized without sponsorship", r"\bauthori[sz]ed\s+to\s+work\b[^.]{0,80}\bwithout\s+(?:\w+\s+){0,3}sponsorship\b"),
+    ("citizens only", r"\b(?:u\.?s\.?|united states)\s+citizens?\s+only\b|\bonly\s+(?:u\.?s\.?|united states)\s+citizens\b"),
+    ("citizenship required", r"\b(?:u\.?s\.?|united states)\s+citizenship\s+(?:is\s+)?required\b"),
+    ("security clearance required", r"\b(?:active|current)\s+(?:\w+\s+){0,2}(?:security\s+)?clearance\s+(?:is\s+)?required\b"),
+    ("green card required", r"\b(?:green\s+card|permanent\s+resident)\s+(?:holders?\s+)?(?:only|required)\b"),
+]
+
+_LOW_RULES = [
+    ("sponsorship available", r"\b(?:visa\s+|immigration\s+|h-?1b\s+)?sponsorship\s*[:\-\u2013]?\s*(?:is\s+)?(?:available|offered|provided|possible|supported)\b|\bsponsorship\s*:\s*yes\b"),
+    ("will sponsor", r"\b(?:will|can|do|does|happy to|able to|willing to|open to)\s+(?:\w+\s+){0,2}sponsor(?:ing)?\b"),
+    ("offers sponsorship", r"\b(?:offer|offers|provide|provides|support|supports)\s+(?:\w+\s+){0,2}(?:visa|h-?1b|immigration)\s+sponsorship\b"),
+    ("h-1b transfer", r"\bh-?1b\s+(?:transfers?|sponsorship)\s+(?:are\s+|is\s+)?(?:welcome|accepted|available|supported)\b"),
+]
+
+_HIGH_PATTERNS = [(label, re.compile(p, re.IGNORECASE)) for label, p in _HIGH_RULES]
+_LOW_PATTERNS = [(label, re.compile(p, re.IGNORECASE)) for label, p in _LOW_RULES]
+
+# "Sponsor" also covers relocation, certifications, training and events. A sponsorship match only
+# counts when its clause names a visa, or, failing that, names none of those other things. A bare
+# verb ("will sponsor", "do not sponsor") also needs a visa object unless it ends the clause
+# ("we will not be sponsoring.").
+_VISA_OBJECT_RE = re.compile(r"\b(?:visas?|immigration|h-?1b|tn|work\s+(?:authori[sz]ation|permits?)|employment\s+authori[sz]ation|green\s+cards?)\b", re.IGNORECASE)
+_NON_VISA_RE = re.compile(r"\b(?:relocation|moving|certifications?|certificates?|education|tuition|degrees?|courses?|training|conferences?|events?|memberships?|licen[cs]\w*)\b", re.IGNORECASE)
+_CLAUSE_BREAK_RE = re.compile(r"[.;!?\n]")
+_OBJECT_TAIL_RE = re.compile(r"(?:[ \t]+[\w/'\u2019-]+){0,4}")
+_BARE_VERB_RE = re.compile(r"sponsor(?:ing)?$", re.IGNORECASE)
+
+# Cheap pre-filter: postings that never mention these stems cannot match any rule
+_TRIGGER_RE = re.compile(r"sponsor|authori[sz]ed|eligible to work|permitted to work|citizen|clearance|green card|permanent resident|h-?1b", re.IGNORECASE)
+
+# Panel members whose lens is visa/sponsorship feasibility
+_VISA_AGENT_RE = re.compile(r"visa|sponsor|immigration|work authori[sz]ation", re.IGNORECASE)
+
+
+def _about_visa(text: str, match) -> bool:
+    matched = match.group(0)
+    if "sponsor" not in matched.lower():
+        return True
+    clause_start = max((b.end() for b in _CLAUSE_BREAK_RE.finditer(text, 0, match.start())), default=0)
+    tail = _OBJECT_TAIL_RE.match(text, match.end()).group(0)
+    window = text[clause_start:match.start()] + matched + tail
+    if _VISA_OBJECT_RE.search(window):
+        return True
+    if _NON_VISA_RE.search(window):
+        return False
+    return not (_BARE_VERB_RE.search(matched) and tail.strip())
+
+
+def _matches(patterns, text: str) -> list:
+    return [label for label, pattern in patterns if any(_about_visa(text, m) for m in pattern.finditer(text))]
+
+
+def _mask(patterns, text: str) -> str:
+    for _, pattern in patterns:
+        text = pattern.sub(" ", text)
+    return text
+
+
+def classify_visa_risk(description: str):
+    """
+    Classifies visa risk from explicit sponsorship phrases in a job description.
+    Returns {"visaRisk": "LOW"|"HIGH", "evidence": [...]} when the posting is unambiguous,
+    or None when there is no signal or the signals conflict (the LLM decides those).
+    """
+    if not description or not _TRIGGER_RE.search(description):
+        return None
+
+    high = _matches(_HIGH_PATTERNS, description)
+    # Negated phrases ("will not sponsor", "no sponsorship available") are masked out
+    # before the LOW rules run; a posting still hitting both sides is treated as ambiguous.
+    low = _matches(_LOW_PATTERNS, _mask(_HIGH_PATTERNS, description))
+    if high and not low:
+        return {"visaRisk": "HIGH", "evidence": high}
+    if low and not high:
+        return {"visaRisk": "LOW", "evidence": low}
+    return None
+
+
+def is_visa_agent(config: dict) -> bool:
+    """True when a panel agent's name/role/focus is the visa/sponsorship lens."""
+    return bool(_VISA_AGENT_RE.search(" ".join(str(config.get(k, "")) for k in ("name", "role", "focus"))))
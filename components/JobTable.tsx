@@ -13,7 +13,7 @@ interface JobTableProps {
   generationProgress?: Record<string, { phase?: string; percent?: number; message?: string }>;
 }
 
-type SortField = 'publishedAt' | 'matchScore';
+type SortField = 'publishedAt' | 'matchScore' | 'skillCoverage';
 type SortDirection = 'asc' | 'desc';
 
 const VisaBadge: React.FC<{ risk?: string }> = ({ risk }) => {
@@ -66,6 +66,29 @@ const MatchBar: React.FC<{ score?: number }> = ({ score }) => {
   );
 };
 
+const SkillCoverage: React.FC<{ job: Job }> = ({ job }) => {
+  if (job.skillCoverage === undefined || job.skillCoverage === null) {
+    return <span className="text-gray-300 text-xs font-medium">—</span>;
+  }
+
+  const title = [
+    job.matchedSkills?.length ? `Have: ${job.matchedSkills.join(', ')}` : '',
+    job.missingSkills?.length ? `Missing: ${job.missingSkills.join(', ')}` : '',
+    job.niceToHaveSkills?.length ? `Nice to have: ${job.niceToHaveSkills.join(', ')}` : '',
+  ].filter(Boolean).join('\n');
+
+  return (
+    <div className="flex flex-col gap-1" title={title}>
+      <span className="text-sm font-semibold text-gray-700">{job.skillCoverage}%</span>
+      {job.missingSkills && job.missingSkills.length > 0 && (
+        <span className="text-[10px] text-gray-400 truncate max-w-[140px]">
+          Missing: {job.missingSkills.join(', ')}
+        </span>
+      )}
+    </div>
+  );
+};
+
 const formatDate = (dateString?: string) => {
   if (!dateString) return 'N/A';
   try {
@@ -228,6 +251,16 @@ export const JobTable: React.FC<JobTableProps> = ({ jobs, onGenerate, isProcessi
                   <SortIcon field="matchScore" />
                 </div>
               </th>
+              <th 
+                className="px-6 py-4 text-xs font-semibold text-gray-500 uppercase tracking-wider cursor-pointer hover:bg-gray-100 transition-colors select-none"
+                onClick={() => handleSort('skillCoverage')}
+                title="Share of the posting's must-have skills found in your resume"
+              >
+                <div className="flex items-center gap-1">
+                  Skills
+                  <SortIcon field="skillCoverage" />
+                </div>
+              </th>
               <th className="px-6 py-4 text-xs font-semibold text-gray-500 uppercase tracking-wider text-right">Action</th>
             </tr>
           </thead>
@@ -306,6 +339,11 @@ export const JobTable: React.FC<JobTableProps> = ({ jobs, onGenerate, isProcessi
                   <MatchBar score={job.matchScore} />
                 </td>
 
+                {/* Skills */}
+                <td className="px-6 py-4 align-top">
+                  <SkillCoverage job={job} />
+                </td>
+
                 {/* Action */}
                 <td className="px-6 py-4 text-right align-top">
                   <div className="flex items-center justify-end gap-2">
@@ -12,6 +12,12 @@ export interface JobAnalysisResult {
   visaRisk: 'LOW' | 'MEDIUM' | 'HIGH';
   reasoning?: string;
   evaluatedBy?: string;
+  evaluationTier?: 'light' | 'full';
+  visaRiskSource?: 'rules';
+  matchedSkills?: string[];
+  missingSkills?: string[];
+  niceToHaveSkills?: string[];
+  skillCoverage?: number | null;
 }
 
 // ============================================================================
@@ -75,6 +81,20 @@ export interface BatchAnalysisResponse {
   // Agents are no longer returned from the batch analysis endpoint
 }
 
+// Returned instead of BatchAnalysisResponse when the request sends
+// `Accept: application/vnd.safesubmit.columnar+json` (parallel arrays, same order)
+export interface ColumnarBatchResponse {
+  format: 'columnar';
+  count: number;
+  columns: {
+    id: string[];
+    matchScore: number[];
+    visaRisk: Array<'LOW' | 'MEDIUM' | 'HIGH'>;
+  };
+  error?: string;
+  partial?: boolean;
+}
+
 export const analyzeJobsInBatch = async (
   resumeText: string, 
   userIntent: string,
@@ -96,7 +116,7 @@ export const analyzeJobsInBatch = async (
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ resumeText, userIntent, jobs: [job], agents }), // Send one job at a time for immediate updates
+        body: JSON.stringify({ resumeText, userIntent, agents, jobs: [job] }), // Send one job at a time for immediate updates
       });
 
       if (!response.ok) {
@@ -134,7 +154,8 @@ export const analyzeJobsInBatchV2 = async (
     const resp = await fetch(`${API_BASE_URL}/jobs/evaluate_batch_v2`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ resumeText, userIntent, jobs, instructions }),
+      // jobs last: the backend parses the body as it arrives and starts scoring at the first job
+      body: JSON.stringify({ resumeText, userIntent, instructions, jobs }),
     });
     if (!resp.ok) {
       const err = await resp.json();
@@ -19,6 +19,12 @@ export interface Job {
   visaRisk?: 'LOW' | 'MEDIUM' | 'HIGH';
   reasoning?: string;
   evaluatedBy?: string; // Name of the agent who evaluated this
+  evaluationTier?: 'light' | 'full'; // Cascade tier that produced the verdict
+  visaRiskSource?: 'rules'; // Set when visa risk came from the local pre-classifier
+  matchedSkills?: string[]; // Must-have skills found in the resume (local skill index)
+  missingSkills?: string[]; // Must-have skills absent from the resume
+  niceToHaveSkills?: string[]; // Skills the posting lists as preferred / a plus
+  skillCoverage?: number | null; // 0-100 share of must-haves covered (null when the posting names none)
   
   status: 'NEW' | 'PROCESSING' | 'DONE';
   generatedResume?: string; // Markdown content